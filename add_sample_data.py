@@ -72,8 +72,8 @@ sample_visas = [
 ]
 
 # Add visas to database
+db.save_visas_batch(sample_visas)
 for visa_data in sample_visas:
-    db.save_visa(**visa_data)
     print(f"✓ Added: {visa_data['visa_type']} ({visa_data['country']})")
 
 print(f"\n{len(sample_visas)} visas added!\n")
@@ -36,20 +36,30 @@ def parse_arguments(args):
     return options
 
 
+# (field, prompt, caster) for each interactive profile question
+_PROFILE_PROMPTS = (
+    ('age', "Age: ", int),
+    ('nationality', "Nationality: ", str.strip),
+    ('education', "Education (secondary/diploma/bachelors/masters/phd): ", str.strip),
+    ('profession', "Profession: ", str.strip),
+    ('experience_years', "Years of work experience: ", int),
+    ('target_countries', "Target countries (comma-separated): ",
+     lambda value: [c.strip() for c in value.split(',')]),
+)
+
+
 def get_user_profile_interactive():
-    """Get user profile via interactive prompts"""
+    """Get user profile via interactive prompts (re-asks on invalid input)"""
     print("\n👤 Let's build your profile:\n")
 
-    profile = {
-        'age': int(input("Age: ")),
-        'nationality': input("Nationality: "),
-        'education': input("Education (secondary/diploma/bachelors/masters/phd): "),
-        'profession': input("Profession: "),
-        'experience_years': int(input("Years of work experience: ")),
-        'target_countries': input("Target countries (comma-separated): ").split(',')
-    }
-
-    profile['target_countries'] = [c.strip() for c in profile['target_countries']]
+    profile = {}
+    for field, prompt, caster in _PROFILE_PROMPTS:
+        while True:
+            try:
+                profile[field] = caster(input(prompt))
+                break
+            except ValueError:
+                print("   Please enter a valid number.")
 
     return profile
 
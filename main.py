@@ -4,12 +4,12 @@ Immigration Platform - Main Entry Point
 """
 
 import sys
-import yaml
+
+from shared.config_manager import load_yaml_file
 
 def load_config():
     """Load global configuration"""
-    with open('config.yaml', 'r') as f:
-        return yaml.safe_load(f)
+    return load_yaml_file('config.yaml')
 
 def show_help():
     """Display help message"""
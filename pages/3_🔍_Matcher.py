@@ -293,12 +293,12 @@ with tab2:
                         status_text.text(f"Matching against {total_visas} visas...")
                         progress_bar.progress(0.1)
 
-                    def on_match(match):
-                        all_matches.append(match)
-                        visa_type = match.get('visa_type', 'Unknown')
-                        score = match.get('match_score', 0)
-
-                        logs.append(f"[MATCH] ✅ {visa_type}: {score:.1f}% match")
+                    def on_match(batch):
+                        all_matches.extend(batch)
+                        for match in batch:
+                            visa_type = match.get('visa_type', 'Unknown')
+                            score = match.get('match_score', 0)
+                            logs.append(f"[MATCH] ✅ {visa_type}: {score:.1f}% match")
                         log_area.code('\n'.join(logs[-20:]))
 
                         status_text.text(f"Found {len(all_matches)} matches...")
@@ -7,6 +7,7 @@ import streamlit as st
 import os
 from pathlib import Path
 from shared.config_manager import get_config
+from shared.service_config import clear_config_caches
 
 
 st.set_page_config(
@@ -170,10 +171,12 @@ with tab2:
         )
 
     if st.button("💾 Save LLM Settings", type="primary"):
-        config.set('llm.provider', llm_provider)
-        config.set('llm.model', llm_model)
-        config.set('llm.temperature', llm_temp)
-        config.set('llm.max_tokens', llm_max_tokens)
+        config.set_many({
+            'llm.provider': llm_provider,
+            'llm.model': llm_model,
+            'llm.temperature': llm_temp,
+            'llm.max_tokens': llm_max_tokens
+        })
         st.success("✅ LLM settings saved to database!")
         st.rerun()
 
@@ -215,9 +218,15 @@ with tab2:
         )
 
     if st.button("💾 Save Crawler Settings", type="primary"):
-        config.set('crawler.delay', crawler_delay)
-        config.set('crawler.max_pages', crawler_max_pages)
-        config.set('crawler.max_depth', crawler_max_depth)
+        config.set_many({
+            'crawler.delay': crawler_delay,
+            'crawler.max_pages': crawler_max_pages,
+            'crawler.max_depth': crawler_max_depth
+        })
+
+        # Make the next crawl pick up the saved settings
+        clear_config_caches()
+
         st.success("✅ Crawler settings saved to database!")
         st.rerun()
 
@@ -246,8 +255,10 @@ with tab2:
         )
 
     if st.button("💾 Save App Settings", type="primary"):
-        config.set('app.log_level', log_level)
-        config.set('app.default_country', default_country)
+        config.set_many({
+            'app.log_level': log_level,
+            'app.default_country': default_country
+        })
         st.success("✅ App settings saved to database!")
         st.rerun()
 
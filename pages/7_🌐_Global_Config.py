@@ -14,6 +14,8 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
 from shared.config_manager import get_config
+from shared.service_config import clear_config_caches
+
 
 st.set_page_config(
     page_title="Global Config",
@@ -177,6 +179,7 @@ with tabs[1]:
         success = config_mgr.set_list_config('keywords', keywords_list)
 
         if success:
+            clear_config_caches()
             st.success(f"✅ Saved {len(keywords_list)} keywords")
             st.rerun()
         else:
@@ -199,6 +202,7 @@ with tabs[1]:
                 if kw not in current_keywords:
                     current_keywords.append(kw)
                     config_mgr.set_list_config('keywords', current_keywords)
+                    clear_config_caches()
                     st.rerun()
 
 # ============ TAB 3: Visa Categories ============
@@ -512,6 +516,7 @@ with tabs[4]:
             config_mgr.set('crawler.delay', delay)
             config_mgr.set('crawler.max_pages', max_pages)
             config_mgr.set('crawler.max_depth', max_depth)
+            clear_config_caches()
             st.success("✅ Crawler settings saved")
             st.rerun()
 
@@ -614,6 +619,7 @@ with tabs[5]:
             success = config_mgr.reset_to_defaults()
 
             if success:
+                clear_config_caches()
                 st.success("✅ Configuration reset to YAML defaults!")
                 st.balloons()
                 st.rerun()
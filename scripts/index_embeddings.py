@@ -50,6 +50,7 @@ def index_all_visas():
     # Create embeddings
     indexed = 0
     skipped = 0
+    embeddings = []
 
     for i, visa in enumerate(visas, 1):
         try:
@@ -77,15 +78,8 @@ def index_all_visas():
             # Create embedding
             embedding = model.encode(text, convert_to_numpy=True)
 
-            # Convert numpy array to bytes for storage
-            embedding_bytes = embedding.tobytes()
-
-            # Save to database
-            db.save_embedding(
-                visa_id=visa['id'],
-                embedding=embedding_bytes,
-                model_name=model_name
-            )
+            # Saved to database in one batch below (stored as float16)
+            embeddings.append((visa['id'], embedding))
 
             indexed += 1
 
@@ -98,6 +92,8 @@ def index_all_visas():
             skipped += 1
             continue
 
+    db.save_embeddings_batch(embeddings, model_name=model_name)
+
     print()
     print("=" * 80)
     print("✅ INDEXING COMPLETE")
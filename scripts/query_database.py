@@ -3,6 +3,8 @@ Database Query Utility
 Run queries on your SQLite database
 """
 
+from itertools import islice
+
 from shared.database import Database
 import json
 
@@ -36,13 +38,15 @@ def query_visas(country=None, limit=10):
     print("-" * 80)
 
     db = Database()
-    visas = db.get_latest_visas(country=country)
+    total = db.count_visas(country=country)
 
-    if not visas:
+    if not total:
         print("No visas found")
         return
 
-    for i, visa in enumerate(visas[:limit], 1):
+    # Only the rows shown are read and decoded
+    visas = islice(db.iter_latest_visas(country=country), limit)
+    for i, visa in enumerate(visas, 1):
         print(f"\n{i}. {visa['visa_type']}")
         print(f"   Country: {visa['country']}, Category: {visa['category']}")
         print(f"   Processing time: {visa['processing_time']}")
@@ -59,8 +63,8 @@ def query_visas(country=None, limit=10):
             if req.get('experience_years'):
                 print(f"     - Experience: {req['experience_years']} years")
 
-    if len(visas) > limit:
-        print(f"\n... and {len(visas) - limit} more visas")
+    if total > limit:
+        print(f"\n... and {total - limit} more visas")
 
 
 def query_visa_history(visa_type, country):
@@ -33,9 +33,9 @@ def semantic_search(query: str, top_k: int = 5):
     # Create query embedding
     query_embedding = model.encode(query, convert_to_numpy=True)
 
-    # Load all embeddings from database
+    # Load all embeddings from database as one normalized matrix
     db = Database()
-    stored_embeddings = db.get_embeddings()
+    stored_embeddings, matrix = db.get_embedding_matrix()
 
     if not stored_embeddings:
         print("⚠️  No embeddings found in database!")
@@ -45,36 +45,33 @@ def semantic_search(query: str, top_k: int = 5):
 
     print(f"Searching through {len(stored_embeddings)} indexed visas...\n")
 
-    # Calculate similarities
-    similarities = []
+    # Cosine similarity against every visa at once (rows are unit length)
+    query_norm = np.linalg.norm(query_embedding) or 1.0
+    scores = matrix @ (query_embedding.astype(np.float32) / query_norm)
 
-    for item in stored_embeddings:
-        # Convert bytes back to numpy array
-        visa_embedding = np.frombuffer(item['embedding'], dtype=np.float32)
+    # Top-k without sorting every score (highest first)
+    k = max(0, min(top_k, len(scores)))
+    top = np.argpartition(-scores, k - 1)[:k] if k else np.array([], dtype=np.intp)
+    top = top[np.argsort(-scores[top], kind='stable')]
 
-        # Cosine similarity
-        similarity = np.dot(query_embedding, visa_embedding) / (
-            np.linalg.norm(query_embedding) * np.linalg.norm(visa_embedding)
-        )
+    similarities = [
+        {
+            'visa_id': stored_embeddings[i]['visa_id'],
+            'visa_type': stored_embeddings[i]['visa_type'],
+            'country': stored_embeddings[i]['country'],
+            'similarity': float(scores[i])
+        }
+        for i in top
+    ]
 
-        similarities.append({
-            'visa_id': item['visa_id'],
-            'visa_type': item['visa_type'],
-            'country': item['country'],
-            'similarity': float(similarity)
-        })
+    # Get full visa details for top results (loaded once)
+    visas_by_id = {v['id']: v for v in db.get_latest_visas()}
 
-    # Sort by similarity (highest first)
-    similarities.sort(key=lambda x: x['similarity'], reverse=True)
-
-    # Get full visa details for top results
     print("Results:")
     print("-" * 80)
 
-    for i, result in enumerate(similarities[:top_k], 1):
-        # Get full visa details
-        visas = db.get_latest_visas()
-        visa = next((v for v in visas if v['id'] == result['visa_id']), None)
+    for i, result in enumerate(similarities, 1):
+        visa = visas_by_id.get(result['visa_id'])
 
         if not visa:
             continue
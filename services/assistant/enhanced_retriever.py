@@ -11,7 +11,7 @@ All models run locally - 100% FREE
 Falls back gracefully if models not installed.
 """
 
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import re
 from shared.database import Database
 from shared.models import Visa
@@ -30,6 +30,8 @@ class EnhancedRetriever:
         self.config = config
         self.db = Database()
         self.logger = setup_logger('enhanced_retriever')
+        # (data_version, visa dicts) - decoded once, reused until visas change
+        self._visa_snapshot: Optional[Tuple[Tuple[int, int], List[Dict]]] = None
 
         # Initialize optional components
         self.semantic_retriever = self._init_semantic_search()
@@ -62,13 +64,23 @@ class EnhancedRetriever:
             self.logger.info(f"Reranking not available: {str(e)[:50]}")
             return None
 
+    def _get_visa_dicts(self) -> List[Dict]:
+        """
+        Get all latest visas as dicts from a snapshot refreshed when visa data changes.
+
+        Returns:
+            List of visa dictionaries (shared; treat as read-only)
+        """
+        data_version = self.db.get_visa_data_version()
+        if self._visa_snapshot is None or self._visa_snapshot[0] != data_version:
+            self._visa_snapshot = (data_version, [v.to_dict() for v in self.db.get_visas()])
+        return self._visa_snapshot[1]
+
     def _index_visas(self):
         """Index all visas for semantic search"""
         try:
-            visas = self.db.get_visas()
-            if visas:
-                # Convert to dicts for indexing
-                visa_dicts = [v.to_dict() for v in visas]
+            visa_dicts = self._get_visa_dicts()
+            if visa_dicts:
                 self.semantic_retriever.index_visas(visa_dicts)
         except Exception as e:
             self.logger.error(f"Failed to index visas: {e}")
@@ -87,16 +99,13 @@ class EnhancedRetriever:
         5. Rerank top results
         6. Return final results
         """
-        # Load all visas
-        all_visas = self.db.get_visas()
+        # Load all visas (decoded snapshot, rebuilt only when visas change)
+        visa_dicts = self._get_visa_dicts()
 
-        if not all_visas:
+        if not visa_dicts:
             self.logger.warning("No visa data found")
             return []
 
-        # Convert to dicts for processing
-        visa_dicts = [v.to_dict() for v in all_visas]
-
         # Step 1: Extract and apply filters
         filters = self._extract_filters(query)
         if filters:
@@ -121,7 +130,8 @@ class EnhancedRetriever:
         results = self._rerank(query, candidates, max_results)
 
         self.logger.info(f"Returning {len(results)} visas")
-        return results
+        # Copies, so callers can't alter the cached snapshot
+        return [dict(visa) for visa in results]
 
     def _extract_filters(self, query: str) -> Dict:
         """Extract country and category from query"""
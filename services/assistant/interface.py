@@ -7,8 +7,15 @@ INTERIOR Interface: Python API for service-to-service communication
 EXTERIOR Interface: Used by UI, CLI, and external systems
 """
 
+import json
+from pathlib import Path
 from typing import List, Dict, Callable, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from services.assistant.engine import AssistantEngine
 from services.assistant.repository import AssistantRepository
 from shared.logger import setup_logger
@@ -178,11 +185,14 @@ class AssistantController:
         Args:
             filepath: Output file path
         """
-        import json
-
         history = self.get_conversation_history()
-        with open(filepath, 'w') as f:
-            json.dump(history, f, indent=2)
+        if orjson is not None:
+            # Serializes straight to bytes, no intermediate str
+            data = orjson.dumps(history, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            Path(filepath).write_bytes(data)
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(history, f, indent=2)
 
         self.logger.info(f"Exported conversation to {filepath}")
 
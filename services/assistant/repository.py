@@ -51,7 +51,7 @@ class AssistantRepository:
 
     def get_visa_count(self) -> int:
         """Get total number of visas"""
-        return len(self.db.get_visas())
+        return self.db.count_visas()
 
     def get_general_content(self, country: Optional[str] = None) -> List[GeneralContent]:
         """
@@ -8,7 +8,7 @@ This module provides:
 - Context formatting for LLM prompts
 """
 
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from shared.database import Database
 from shared.models import Visa, GeneralContent
 from shared.logger import setup_logger
@@ -25,6 +25,20 @@ class ContextRetriever:
         self.config = config
         self.db = Database()
         self.logger = setup_logger('retriever')
+        # (data_version, visas) - decoded once, reused until visas change
+        self._visa_snapshot: Optional[Tuple[Tuple[int, int], List[Visa]]] = None
+
+    def _get_visas(self) -> List[Visa]:
+        """
+        Get all latest visas from a snapshot refreshed when visa data changes.
+
+        Returns:
+            List of Visa objects (shared; treat as read-only)
+        """
+        data_version = self.db.get_visa_data_version()
+        if self._visa_snapshot is None or self._visa_snapshot[0] != data_version:
+            self._visa_snapshot = (data_version, self.db.get_visas())
+        return self._visa_snapshot[1]
 
     def retrieve_relevant_visas(self, query: str, user_profile: Dict = None) -> List[Dict]:
         """
@@ -38,7 +52,7 @@ class ContextRetriever:
             List of visa dictionaries (for backward compatibility)
         """
         # Load all visas as Visa objects
-        all_visas = self.db.get_visas()
+        all_visas = self._get_visas()
 
         if not all_visas:
             self.logger.warning("No visa data found in database")
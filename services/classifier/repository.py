@@ -60,6 +60,30 @@ class ClassifierRepository:
             source_urls=visa.source_urls
         )
 
+    def save_visas_batch(self, visas: List[Visa]) -> int:
+        """
+        Save many extracted visas in one transaction.
+
+        Args:
+            visas: Visa model objects
+
+        Returns:
+            Number of visas saved
+        """
+        return self.db.save_visas_batch([
+            {
+                'visa_type': visa.visa_type,
+                'country': visa.country,
+                'category': visa.category,
+                'requirements': visa.requirements,
+                'fees': visa.fees,
+                'processing_time': visa.processing_time,
+                'documents_required': visa.documents_required,
+                'source_urls': visa.source_urls
+            }
+            for visa in visas
+        ])
+
     def get_visas(self, country: Optional[str] = None) -> List[Visa]:
         """
         Get all extracted visas.
@@ -74,7 +98,7 @@ class ClassifierRepository:
 
     def get_visa_count(self) -> int:
         """Get total number of visas"""
-        return len(self.db.get_visas())
+        return self.db.count_visas()
 
     def save_general_content(self, content: GeneralContent) -> int:
         """
@@ -0,0 +1,139 @@
+"""
+Bloom Filters - memory-bounded URL sets for large crawls
+
+A crawl keeps every visited URL for its lifetime. Storing the strings
+costs ~130 bytes per URL; a Bloom filter needs ~2 bytes per URL at a
+0.1% false-positive rate. A false positive means a URL is treated as
+already visited and skipped - acceptable for crawling.
+
+Pure stdlib (hashlib + bytearray), no extra dependencies.
+"""
+
+import hashlib
+import math
+from typing import List
+
+
+class BloomFilter:
+    """
+    Fixed-capacity Bloom filter over strings.
+
+    Uses double hashing (two 64-bit halves of one BLAKE2b digest)
+    to derive the k bit positions for each item.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialize filter.
+
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: Target false-positive rate at capacity
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        ln2 = math.log(2)
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (ln2 * ln2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * ln2))
+
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> List[int]:
+        """Bit positions for an item"""
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> bool:
+        """
+        Add an item.
+
+        Returns:
+            True if the item was not already (apparently) present
+        """
+        added = False
+        for pos in self._positions(item):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not self._bits[byte] & mask:
+                self._bits[byte] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7))
+            for pos in self._positions(item)
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    def is_full(self) -> bool:
+        """Check if the filter has reached its sized capacity"""
+        return self.count >= self.capacity
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows as items are added.
+
+    When the current filter reaches capacity a new, larger one is added
+    with a tighter error rate, so the overall false-positive rate stays
+    bounded by roughly twice the initial error rate.
+
+    Supports the subset of the set API the crawler uses:
+    add, in, len and clear.
+    """
+
+    GROWTH = 2
+    TIGHTENING = 0.5
+
+    def __init__(self, initial_capacity: int = 100_000, error_rate: float = 0.001):
+        """
+        Initialize filter.
+
+        Args:
+            initial_capacity: Capacity of the first internal filter
+            error_rate: Target overall false-positive rate
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.filters: List[BloomFilter] = []
+        self.clear()
+
+    def add(self, item: str) -> bool:
+        """
+        Add an item.
+
+        Returns:
+            True if the item was not already (apparently) present
+        """
+        if item in self:
+            return False
+
+        current = self.filters[-1]
+        if current.is_full():
+            current = BloomFilter(
+                current.capacity * self.GROWTH,
+                current.error_rate * self.TIGHTENING
+            )
+            self.filters.append(current)
+
+        return current.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        return any(item in f for f in self.filters)
+
+    def __len__(self) -> int:
+        return sum(len(f) for f in self.filters)
+
+    def clear(self):
+        """Remove all items"""
+        self.filters = [
+            BloomFilter(self.initial_capacity, self.error_rate * (1 - self.TIGHTENING))
+        ]
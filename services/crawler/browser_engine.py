@@ -11,10 +11,9 @@ Use this when:
 """
 
 from playwright.sync_api import sync_playwright, Browser, Page
-from bs4 import BeautifulSoup
+import lxml.html
 from urllib.parse import urljoin, urlparse
 from collections import deque
-from datetime import datetime
 import time
 from typing import List, Dict, Set, Optional
 
@@ -22,6 +21,15 @@ from shared.models import CrawledPage
 from shared.logger import setup_logger
 from services.crawler.repository import CrawlerRepository
 
+# Rendered HTML is parsed as UTF-8 bytes; comments are dropped at parse time
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8', remove_comments=True)
+
+# Elements stripped before text extraction
+_NOISE_XPATH = '//script | //style | //nav | //footer | //header'
+
+# Pages buffered before one batched repository write
+_SAVE_BATCH_SIZE = 25
+
 
 class BrowserCrawlerEngine:
     """
@@ -129,6 +137,7 @@ class BrowserCrawlerEngine:
 
         pages_crawled = 0
         pages_saved = 0
+        pending: List[CrawledPage] = []
 
         # Create browser context (simulates real user)
         context = self.browser.new_context(
@@ -149,16 +158,18 @@ class BrowserCrawlerEngine:
                 page_data = self._crawl_page(context, url, country_name, depth)
 
                 if page_data:
-                    # Save via repository
-                    self.repo.save_page(page_data)
+                    # Buffer for a batched save via repository
+                    pending.append(page_data)
                     pages_saved += 1
+                    if len(pending) >= _SAVE_BATCH_SIZE:
+                        self._flush(pending)
 
                     # Add new links to queue
                     for link in page_data.links:
                         if link not in self.visited:
                             self.to_visit.append((link, depth + 1))
 
-                    self.logger.info(f"✓ Saved: {page_data.title[:60]}")
+                    self.logger.info(f"✓ Crawled: {page_data.title[:60]}")
 
                 self.visited.add(url)
                 pages_crawled += 1
@@ -167,6 +178,8 @@ class BrowserCrawlerEngine:
                 time.sleep(delay)
 
         finally:
+            # Save whatever is buffered, even if the crawl was interrupted
+            self._flush(pending)
             context.close()
 
         self.logger.info(f"Browser crawl complete: {pages_saved}/{pages_crawled} pages saved")
@@ -178,6 +191,14 @@ class BrowserCrawlerEngine:
             'urls_queued': len(self.to_visit)
         }
 
+    def _flush(self, pending: List[CrawledPage]):
+        """Save buffered pages in one transaction and empty the buffer"""
+        if not pending:
+            return
+        self.repo.save_pages_batch(pending)
+        self.logger.info(f"Saved batch of {len(pending)} pages")
+        pending.clear()
+
     def _crawl_page(self, context, url: str, country: str, depth: int) -> Optional[CrawledPage]:
         """
         Fetch and parse a single page using browser.
@@ -208,19 +229,22 @@ class BrowserCrawlerEngine:
                 # Get page content
                 html_content = page.content()
 
-                # Parse with BeautifulSoup
-                soup = BeautifulSoup(html_content, 'html.parser')
+                # Parse once with lxml
+                doc = lxml.html.document_fromstring(
+                    html_content.encode('utf-8', 'replace'), parser=_HTML_PARSER
+                )
 
                 # Extract title
-                title = soup.title.string if soup.title else url
-                title = title.strip()
+                title = (doc.findtext('.//title') or url).strip()
 
                 # Extract text content
                 # Remove script and style elements
-                for script in soup(['script', 'style', 'nav', 'footer', 'header']):
-                    script.decompose()
+                for element in doc.xpath(_NOISE_XPATH):
+                    element.drop_tree()
 
-                text_content = soup.get_text(separator=' ', strip=True)
+                text_content = ' '.join(
+                    chunk.strip() for chunk in doc.itertext() if chunk.strip()
+                )
 
                 # Check if relevant
                 if not self._is_relevant(text_content, title):
@@ -228,7 +252,7 @@ class BrowserCrawlerEngine:
                     return None
 
                 # Extract links
-                links = self._extract_links(soup, url)
+                links = self._extract_links(doc, url)
 
                 # Create CrawledPage model
                 crawled_page = CrawledPage(
@@ -236,12 +260,12 @@ class BrowserCrawlerEngine:
                     country=country,
                     title=title,
                     content=text_content[:50000],  # Limit to 50k chars
-                    html=html_content[:100000],  # Limit HTML to 100k chars
-                    links=links,
-                    crawled_at=datetime.now(),
-                    status='success',
-                    depth=depth,
-                    metadata={'method': 'browser', 'user_agent': 'Chrome/120'}
+                    metadata={
+                        'links': links,
+                        'depth': depth,
+                        'method': 'browser',
+                        'user_agent': 'Chrome/120'
+                    }
                 )
 
                 return crawled_page
@@ -276,26 +300,35 @@ class BrowserCrawlerEngine:
         # Check if any keyword appears
         return any(keyword.lower() in text_to_check for keyword in keywords)
 
-    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
+    def _extract_links(self, doc, base_url: str) -> List[str]:
         """
         Extract and filter relevant links from page.
 
         Args:
-            soup: BeautifulSoup object
+            doc: Parsed lxml document
             base_url: Base URL for resolving relative links
 
         Returns:
             List of absolute URLs
         """
         links = []
+        seen = set()
         base_domain = urlparse(base_url).netloc
+        exclude_patterns = self.config.get('exclude_patterns', [])
 
-        for link in soup.find_all('a', href=True):
-            href = link['href']
+        # Single pass over anchors; stop once the per-page limit is reached
+        for anchor in doc.iter('a'):
+            href = anchor.get('href')
+            if not href:
+                continue
 
             # Convert to absolute URL
             absolute_url = urljoin(base_url, href)
 
+            if absolute_url in seen:  # No duplicates
+                continue
+            seen.add(absolute_url)
+
             # Parse URL
             parsed = urlparse(absolute_url)
 
@@ -303,9 +336,10 @@ class BrowserCrawlerEngine:
             if (
                 parsed.scheme in ['http', 'https'] and  # Valid scheme
                 parsed.netloc == base_domain and  # Same domain
-                not any(exc in absolute_url for exc in self.config.get('exclude_patterns', [])) and  # Not excluded
-                absolute_url not in links  # No duplicates
+                not any(exc in absolute_url for exc in exclude_patterns)  # Not excluded
             ):
                 links.append(absolute_url)
+                if len(links) >= 50:  # Limit to 50 links per page
+                    break
 
-        return links[:50]  # Limit to 50 links per page
+        return links
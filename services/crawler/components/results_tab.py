@@ -3,9 +3,51 @@ Crawler Results Tab Component - Enhanced with Database View
 """
 
 import streamlit as st
+import io
 import json
 import pandas as pd
+from dataclasses import asdict
+from typing import List, Set
 from shared.database import Database
+from shared.models import PageRow
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Scoped reruns need Streamlit 1.33+; older versions rerun the whole tab
+_fragment = (getattr(st, 'fragment', None)
+             or getattr(st, 'experimental_fragment', None)
+             or (lambda func: func))
+
+
+def _json_bytes(data, pretty: bool = False) -> bytes:
+    """
+    Serialize export data straight to bytes.
+
+    Uses orjson when installed (produces bytes directly, no intermediate str),
+    otherwise falls back to the standard json module.
+
+    Args:
+        data: JSON-serializable data (non-serializable values become strings)
+        pretty: Indent output by two spaces
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(data, default=str, option=option)
+    return json.dumps(data, indent=2 if pretty else None, default=str).encode('utf-8')
+
+
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    """Write a DataFrame as CSV into a buffer and return UTF-8 bytes"""
+    buf = io.StringIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue().encode('utf-8')
+
 
 class ResultsTab:
     """Handles results display with database view"""
@@ -23,7 +65,7 @@ class ResultsTab:
             st.markdown("### All Crawled Pages in Database")
 
             db = Database()
-            pages = db.get_latest_pages()
+            pages = db.get_page_rows()
 
             if not pages:
                 st.warning("⚠️ No pages crawled yet. Run the crawler first.")
@@ -33,10 +75,10 @@ class ResultsTab:
                 with col1:
                     st.metric("Total Pages", len(pages))
                 with col2:
-                    countries = set(p['country'] for p in pages)
+                    countries = set(p.country for p in pages)
                     st.metric("Countries", len(countries))
                 with col3:
-                    total_content = sum(len(p.get('content', '')) for p in pages)
+                    total_content = sum(p.content_len for p in pages)
                     st.metric("Total Content", f"{total_content // 1000}K chars")
                 with col4:
                     # Check how many are unclassified
@@ -45,129 +87,10 @@ class ResultsTab:
 
                 st.markdown("---")
 
-                # Filters
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    country_filter = st.selectbox(
-                        "Filter by Country",
-                        ["All"] + sorted(list(countries)),
-                        key="db_country_filter_crawler"
-                    )
-                with col2:
-                    search_term = st.text_input("Search Title/URL", "", key="db_search_crawler")
-                with col3:
-                    classification_filter = st.selectbox(
-                        "Classification Status",
-                        ["All", "Classified", "Unclassified"],
-                        key="classification_filter"
-                    )
-
-                # Apply filters
-                filtered_pages = pages
-                if country_filter != "All":
-                    filtered_pages = [p for p in filtered_pages if p['country'] == country_filter]
-                if search_term:
-                    filtered_pages = [p for p in filtered_pages if
-                                     search_term.lower() in p['title'].lower() or
-                                     search_term.lower() in p['url'].lower()]
-
-                # Classification filter
-                if classification_filter == "Classified":
-                    # Get URLs of classified pages
-                    visas = db.get_visas()
-                    classified_urls = set()
-                    for visa in visas:
-                        if visa.source_urls:
-                            classified_urls.update(visa.source_urls)
-                    filtered_pages = [p for p in filtered_pages if p['url'] in classified_urls]
-                elif classification_filter == "Unclassified":
-                    visas = db.get_visas()
-                    classified_urls = set()
-                    for visa in visas:
-                        if visa.source_urls:
-                            classified_urls.update(visa.source_urls)
-                    filtered_pages = [p for p in filtered_pages if p['url'] not in classified_urls]
-
-                st.markdown(f"**Showing {len(filtered_pages)} of {len(pages)} pages**")
-
-                # Display options
-                view_mode = st.radio("View Mode", ["Table", "Cards"], horizontal=True, key="db_view_mode_crawler")
-
-                if view_mode == "Table":
-                    # Create DataFrame for table view
-                    table_data = []
-                    for page in filtered_pages:
-                        table_data.append({
-                            'Country': page['country'].title(),
-                            'Title': page['title'][:60] + '...' if len(page['title']) > 60 else page['title'],
-                            'URL': page['url'][:50] + '...' if len(page['url']) > 50 else page['url'],
-                            'Content Size': f"{len(page.get('content', ''))} chars",
-                            'Crawled': page.get('crawled_at', 'N/A')[:10],
-                            'Version': page.get('version', 1)
-                        })
-
-                    if table_data:
-                        df = pd.DataFrame(table_data)
-                        st.dataframe(df, use_container_width=True, height=400)
-
-                        # Export
-                        csv = df.to_csv(index=False)
-                        st.download_button(
-                            "📥 Download Table as CSV",
-                            data=csv,
-                            file_name="crawled_pages.csv",
-                            mime="text/csv"
-                        )
-
-                else:  # Cards view
-                    # Card view with pagination
-                    items_per_page = 10
-                    total_pages_paginated = (len(filtered_pages) + items_per_page - 1) // items_per_page
-
-                    page_num = st.number_input("Page", min_value=1, max_value=max(1, total_pages_paginated), value=1, key="db_page_crawler")
-                    start_idx = (page_num - 1) * items_per_page
-                    end_idx = start_idx + items_per_page
-                    page_items = filtered_pages[start_idx:end_idx]
-
-                    for page in page_items:
-                        # Check if classified
-                        visas = db.get_visas()
-                        is_classified = False
-                        for visa in visas:
-                            if page['url'] in visa.source_urls:
-                                is_classified = True
-                                break
-
-                        status_icon = "✅" if is_classified else "⏳"
-
-                        with st.expander(f"{status_icon} {page['country'].title()} - {page['title'][:60]}"):
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                st.write(f"**URL:** {page['url']}")
-                                st.write(f"**Crawled:** {page.get('crawled_at', 'N/A')[:10]}")
-                                st.write(f"**Version:** {page.get('version', 1)}")
-                            with col2:
-                                st.write(f"**Content Size:** {len(page.get('content', ''))} chars")
-                                st.write(f"**Status:** {'Classified' if is_classified else 'Unclassified'}")
-
-                            # Show content preview
-                            if st.checkbox(f"Show Content Preview", key=f"preview_{page.get('id', page['url'])}"):
-                                content = page.get('content', '')
-                                preview = content[:500] + "..." if len(content) > 500 else content
-                                st.text_area("Content", preview, height=150, key=f"content_{page.get('id', page['url'])}")
-
-                    st.caption(f"Page {page_num} of {total_pages_paginated}")
-
-                # Export all filtered data
-                st.markdown("---")
-                export_data = json.dumps(filtered_pages, indent=2, default=str)
-                st.download_button(
-                    "📥 Download All Filtered Pages as JSON",
-                    data=export_data,
-                    file_name="crawled_pages_all.json",
-                    mime="application/json",
-                    key="db_export_json_crawler"
-                )
+                # URLs referenced by any visa, looked up once per render
+                classified_urls = db.get_classified_urls()
+
+                ResultsTab._database_view(db, pages, countries, classified_urls)
 
         # TAB 2: Current Run Results
         with results_tab2:
@@ -206,7 +129,7 @@ class ResultsTab:
             # Export this run
             st.markdown("### 📥 Export This Run")
 
-            export_data = json.dumps(results.get('results', []), indent=2)
+            export_data = _json_bytes(results.get('results', []), pretty=True)
 
             st.download_button(
                 "📥 Download This Run as JSON",
@@ -226,3 +149,141 @@ class ResultsTab:
             1. Run **Classifier** to extract structured visa data
             2. View results in Classifier → Results → Database View
             """)
+
+    @staticmethod
+    @_fragment
+    def _database_view(db: Database, pages: List[PageRow], countries: Set[str], classified_urls: Set[str]):
+        """
+        Render filters, table/cards and export for the database view.
+
+        Runs as a Streamlit fragment where supported, so changing a filter
+        or the page number reruns only this section instead of reloading
+        the pages and metrics for the whole tab.
+
+        Args:
+            db: Database used for on-demand content lookups
+            pages: Page summaries to filter and display
+            countries: Countries present in pages
+            classified_urls: URLs referenced by any visa
+        """
+        # Filters
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            country_filter = st.selectbox(
+                "Filter by Country",
+                ["All"] + sorted(list(countries)),
+                key="db_country_filter_crawler"
+            )
+        with col2:
+            search_term = st.text_input("Search Title/URL", "", key="db_search_crawler")
+        with col3:
+            classification_filter = st.selectbox(
+                "Classification Status",
+                ["All", "Classified", "Unclassified"],
+                key="classification_filter"
+            )
+
+        # Apply filters
+        filtered_pages = pages
+        if country_filter != "All":
+            filtered_pages = [p for p in filtered_pages if p.country == country_filter]
+        if search_term:
+            term = search_term.lower()
+            filtered_pages = [p for p in filtered_pages if
+                             term in p.title.lower() or
+                             term in p.url.lower()]
+
+        # Classification filter
+        if classification_filter == "Classified":
+            filtered_pages = [p for p in filtered_pages if p.url in classified_urls]
+        elif classification_filter == "Unclassified":
+            filtered_pages = [p for p in filtered_pages if p.url not in classified_urls]
+
+        st.markdown(f"**Showing {len(filtered_pages)} of {len(pages)} pages**")
+
+        # Display options
+        view_mode = st.radio("View Mode", ["Table", "Cards"], horizontal=True, key="db_view_mode_crawler")
+
+        if view_mode == "Table":
+            # Create DataFrame for table view
+            table_data = []
+            for page in filtered_pages:
+                table_data.append((
+                    page.country.title(),
+                    page.title[:60] + '...' if len(page.title) > 60 else page.title,
+                    page.url[:50] + '...' if len(page.url) > 50 else page.url,
+                    f"{page.content_len} chars",
+                    page.crawled_at[:10] or 'N/A',
+                    page.version
+                ))
+
+            if table_data:
+                df = pd.DataFrame.from_records(
+                    table_data,
+                    columns=['Country', 'Title', 'URL', 'Content Size', 'Crawled', 'Version']
+                )
+                st.dataframe(df, use_container_width=True, height=400)
+
+                # Export
+                st.download_button(
+                    "📥 Download Table as CSV",
+                    data=_csv_bytes(df),
+                    file_name="crawled_pages.csv",
+                    mime="text/csv"
+                )
+
+        else:  # Cards view
+            # Card view with pagination
+            items_per_page = 10
+            total_pages_paginated = (len(filtered_pages) + items_per_page - 1) // items_per_page
+
+            page_num = st.number_input("Page", min_value=1, max_value=max(1, total_pages_paginated), value=1, key="db_page_crawler")
+            start_idx = (page_num - 1) * items_per_page
+            end_idx = start_idx + items_per_page
+            page_items = filtered_pages[start_idx:end_idx]
+
+            for page in page_items:
+                is_classified = page.url in classified_urls
+
+                status_icon = "✅" if is_classified else "⏳"
+
+                with st.expander(f"{status_icon} {page.country.title()} - {page.title[:60]}"):
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.write(f"**URL:** {page.url}")
+                        st.write(f"**Crawled:** {page.crawled_at[:10] or 'N/A'}")
+                        st.write(f"**Version:** {page.version}")
+                    with col2:
+                        st.write(f"**Content Size:** {page.content_len} chars")
+                        st.write(f"**Status:** {'Classified' if is_classified else 'Unclassified'}")
+
+                    # Show content preview
+                    if st.checkbox(f"Show Content Preview", key=f"preview_{page.id}"):
+                        content = db.get_page_content(page.id)
+                        preview = content[:500] + "..." if len(content) > 500 else content
+                        st.text_area("Content", preview, height=150, key=f"content_{page.id}")
+
+            st.caption(f"Page {page_num} of {total_pages_paginated}")
+
+        # Export all filtered data
+        st.markdown("---")
+        col1, col2 = st.columns(2)
+        with col1:
+            include_content = st.checkbox("Include page content", value=False, key="db_export_content_crawler")
+        with col2:
+            pretty_json = st.checkbox("Pretty-print JSON", value=False, key="db_export_pretty_crawler")
+
+        if include_content:
+            # Full rows are only loaded when content is requested
+            filtered_ids = {p.id for p in filtered_pages}
+            export_rows = [p for p in db.get_latest_pages() if p['id'] in filtered_ids]
+        else:
+            export_rows = [asdict(p) for p in filtered_pages]
+        export_data = _json_bytes(export_rows, pretty=pretty_json)
+        st.download_button(
+            "📥 Download All Filtered Pages as JSON",
+            data=export_data,
+            file_name="crawled_pages_all.json",
+            mime="application/json",
+            key="db_export_json_crawler"
+        )
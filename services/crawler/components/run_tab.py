@@ -95,6 +95,7 @@ class RunTab:
                 current_country_idx[0] += 1
                 logger.add_info(f"\n{'='*50}")
                 logger.add_info(f"Crawling {country}...")
+                logger.flush()
                 progress.update(
                     current_country_idx[0] - 1,
                     total_countries,
@@ -133,3 +134,6 @@ class RunTab:
         except Exception as e:
             logger.add_error(f"Crawling failed: {str(e)}")
             st.error(f"Error: {str(e)}")
+
+        finally:
+            logger.flush()
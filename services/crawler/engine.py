@@ -7,17 +7,94 @@ No direct database access - uses repository for data.
 Think of this as the ENGINE that processes the FUEL (data).
 """
 
+import re
+import codecs
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-from collections import deque
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
 from datetime import datetime
+from itertools import count
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import threading
 import time
-from typing import List, Dict, Set, Tuple, Optional
+from typing import List, Dict, Tuple, Optional
 
 from shared.models import CrawledPage
 from shared.logger import setup_logger
 from services.crawler.repository import CrawlerRepository
+from services.crawler.bloom import ScalableBloomFilter
+
+# Parse pages as UTF-8 bytes so documents carrying an XML encoding
+# declaration are accepted, and drop comments at parse time
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8', remove_comments=True)
+
+# HTTP sessions shared by all engines, keyed by user agent, so crawls of
+# different countries (and fresh engine instances) reuse warm
+# keep-alive connections instead of repeating TCP/TLS handshakes
+_SESSIONS: Dict[str, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+# Connections kept per host in the shared pool; must cover the largest
+# crawling.concurrent_requests so parallel fetches don't discard sockets
+_POOL_SIZE = 32
+
+# Response bodies are streamed in chunks of this size
+_CHUNK_SIZE = 64 * 1024
+
+# Default cap on downloaded bytes per page (crawling.max_page_bytes)
+_DEFAULT_MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+# Default bytes scanned for a keyword before a page is abandoned as
+# irrelevant (crawling.relevance_scan_bytes)
+_DEFAULT_RELEVANCE_SCAN_BYTES = 256 * 1024
+
+# Pages buffered before one batched repository write
+_SAVE_BATCH_SIZE = 25
+
+# Characters of page text kept per page
+_MAX_CONTENT_CHARS = 10000
+
+# Elements stripped before text extraction
+_NOISE_XPATH = '//script | //style | //nav | //header | //footer'
+
+# Breadcrumb selectors, tried in order
+_BREADCRUMB_XPATHS = (
+    '//nav[contains(@aria-label, "breadcrumb")]//a',
+    '//*[contains(concat(" ", normalize-space(@class), " "), " breadcrumb ")]//a',
+)
+
+
+def get_shared_session(user_agent: str) -> requests.Session:
+    """
+    Get the process-wide HTTP session for a user agent.
+
+    Args:
+        user_agent: User-Agent header value
+
+    Returns:
+        Shared requests.Session
+    """
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(user_agent)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': user_agent,
+                'Accept-Encoding': 'gzip, deflate'
+            })
+            # Larger keep-alive pool, plus retries for transient gateway errors
+            adapter = HTTPAdapter(
+                pool_connections=_POOL_SIZE,
+                pool_maxsize=_POOL_SIZE,
+                max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _SESSIONS[user_agent] = session
+        return session
 
 
 class CrawlerEngine:
@@ -36,27 +113,59 @@ class CrawlerEngine:
     - Handle configuration loading
     """
 
-    def __init__(self, config: dict, repository: CrawlerRepository):
+    def __init__(self, config: dict, repository: CrawlerRepository,
+                 session: Optional[requests.Session] = None):
         """
         Initialize engine.
 
         Args:
             config: Crawler configuration
             repository: Data access layer
+            session: HTTP session (defaults to the shared session for
+                the configured user agent)
         """
         self.config = config
         self.repo = repository
         self.logger = setup_logger('crawler_engine')
 
         # Crawl state
-        self.visited: Set[str] = set()
-        self.to_visit: deque = deque()
+        # Bloom filter keeps memory bounded on very large crawls;
+        # a rare false positive only skips a page
+        self.visited = ScalableBloomFilter(initial_capacity=100_000, error_rate=0.001)
+        # Frontier heap of (depth, -url_score, seq, url): shallow pages
+        # first, then URLs mentioning more keywords, then FIFO
+        self.to_visit: List[Tuple[int, int, int, str]] = []
+        self._seq = count()
+        # Every URL ever pushed onto the frontier, so link-dense sites
+        # don't fill the heap with duplicates (superset of visited)
+        self.enqueued = ScalableBloomFilter(initial_capacity=100_000, error_rate=0.0001)
+
+        # Matchers compiled once; these run for every URL and every link
+        self._exclude_re = self._compile_any(
+            re.escape(pattern) for pattern in config['exclude_patterns']
+        )
+        self._attachment_re = self._compile_any(
+            r'\.' + re.escape(ext.lstrip('.')) + r'(?:[?#]|$)'
+            for ext in config['download_extensions']
+        )
+        # Keywords are folded into a prefix trie so the regex engine walks
+        # shared prefixes once instead of retrying every alternative
+        self._relevance_re = self._compile_any(
+            [self._trie_pattern(kw.lower() for kw in config['keywords'])]
+            if config['keywords'] else []
+        )
+        self._keywords_lc = tuple(kw.lower() for kw in config['keywords'])
+        # Characters carried between streamed chunks so keywords split
+        # across a chunk boundary are still found
+        self._keyword_overlap = max((len(kw) for kw in self._keywords_lc), default=1) - 1
 
-        # HTTP session
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': config['crawling']['user_agent']
-        })
+        # Per-host politeness: earliest monotonic time the next request to
+        # each host may start (delay_between_requests applies per host)
+        self._next_fetch_at: Dict[str, float] = {}
+        self._rate_lock = threading.Lock()
+
+        # HTTP session (shared, so connections stay warm across engines)
+        self.session = session or get_shared_session(config['crawling']['user_agent'])
 
     def crawl_country(self, country_name: str, seed_urls: List[str]) -> Dict:
         """
@@ -73,57 +182,118 @@ class CrawlerEngine:
 
         # Initialize queue
         for url in seed_urls:
-            self.to_visit.append((url, 0))  # (url, depth)
+            self._enqueue(self._canonicalize(url), 0)
 
         # Crawl limits
         max_pages = self.config['crawling']['max_pages_per_country']
         max_depth = self.config['crawling']['max_depth']
 
+        # Pages fetched in parallel per batch (crawling.concurrent_requests)
+        concurrency = max(1, self.config['crawling'].get('concurrent_requests', 1))
+
         pages_crawled = 0
         pages_saved = 0
+        pending: List[CrawledPage] = []
+
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                while self.to_visit and pages_crawled < max_pages:
+                    batch = self._next_batch(min(concurrency, max_pages - pages_crawled), max_depth)
+                    if not batch:
+                        continue
+
+                    # Fetch and parse the batch concurrently (network bound)
+                    pages = pool.map(
+                        lambda item: self._crawl_page(item[1], country_name, item[0]),
+                        batch
+                    )
+
+                    # Save and follow links sequentially, in frontier order
+                    for (depth, _), page in zip(batch, pages):
+                        if page:
+                            # Buffer for a batched save via repository
+                            pending.append(page)
+                            pages_saved += 1
+                            if len(pending) >= _SAVE_BATCH_SIZE:
+                                self._flush(pending)
+
+                            # Add new links to queue (duplicates are dropped)
+                            for link in page.links:
+                                self._enqueue(link, depth + 1)
+
+                            self.logger.info(f"✓ Crawled: {page.title[:60]}")
+
+                    pages_crawled += len(batch)
+
+        finally:
+            # Save whatever is buffered, even if the crawl was interrupted
+            self._flush(pending)
 
-        while self.to_visit and pages_crawled < max_pages:
-            url, depth = self.to_visit.popleft()
+        self.logger.info(f"Crawl complete: {pages_saved}/{pages_crawled} pages saved")
+
+        return {
+            'country': country_name,
+            'pages_crawled': pages_crawled,
+            'pages_saved': pages_saved,
+            'urls_queued': len(self.to_visit)
+        }
+
+    def _next_batch(self, size: int, max_depth: int) -> List[Tuple[int, str]]:
+        """
+        Pop up to `size` crawlable URLs off the frontier.
+
+        Visited, too-deep and excluded URLs are skipped. Returned URLs are
+        marked visited immediately so a batch never contains duplicates.
+
+        Args:
+            size: Maximum number of URLs to return
+            max_depth: Maximum crawl depth
+
+        Returns:
+            List of (depth, url) tuples
+        """
+        batch = []
+        while self.to_visit and len(batch) < size:
+            depth, _, _, url = heapq.heappop(self.to_visit)
 
             # Skip if already visited or too deep
             if url in self.visited or depth > max_depth:
                 continue
 
+            self.visited.add(url)
+
             # Skip if excluded
             if self._should_exclude(url):
                 self.logger.info(f"Skipping (excluded): {url}")
-                self.visited.add(url)
                 continue
 
-            # Crawl the page
-            page = self._crawl_page(url, country_name, depth)
-
-            if page:
-                # Save via repository
-                self.repo.save_page(page)
-                pages_saved += 1
-
-                # Add new links to queue
-                for link in page.links:
-                    if link not in self.visited:
-                        self.to_visit.append((link, depth + 1))
+            batch.append((depth, url))
+        return batch
 
-                self.logger.info(f"✓ Saved: {page.title[:60]}")
+    def _flush(self, pending: List[CrawledPage]):
+        """Save buffered pages in one transaction and empty the buffer"""
+        if not pending:
+            return
+        self.repo.save_pages_batch(pending)
+        self.logger.info(f"Saved batch of {len(pending)} pages")
+        pending.clear()
 
-            self.visited.add(url)
-            pages_crawled += 1
-
-            # Rate limiting
-            time.sleep(self.config['crawling']['delay_between_requests'])
+    def _enqueue(self, url: str, depth: int) -> bool:
+        """
+        Push a URL onto the frontier, prioritized by depth then keyword score.
 
-        self.logger.info(f"Crawl complete: {pages_saved}/{pages_crawled} pages saved")
+        URLs already queued once are ignored. The frontier is drained in
+        depth order, so the first time a URL is seen is at its shallowest depth.
 
-        return {
-            'country': country_name,
-            'pages_crawled': pages_crawled,
-            'pages_saved': pages_saved,
-            'urls_queued': len(self.to_visit)
-        }
+        Returns:
+            True if the URL was queued
+        """
+        if not self.enqueued.add(url):
+            return False
+        url_lower = url.lower()
+        score = sum(kw in url_lower for kw in self._keywords_lc)
+        heapq.heappush(self.to_visit, (depth, -score, next(self._seq), url))
+        return True
 
     def _crawl_page(self, url: str, country: str, depth: int) -> Optional[CrawledPage]:
         """
@@ -140,25 +310,104 @@ class CrawlerEngine:
         try:
             self.logger.info(f"Crawling (depth {depth}): {url}")
 
-            # Fetch page
-            response = self.session.get(
-                url,
-                timeout=self.config['crawling']['timeout']
-            )
-            response.raise_for_status()
+            # Fetch page (checks relevance while streaming)
+            html = self._fetch(url)
 
-            # Check relevance
-            if not self._is_relevant(response.text):
+            if html is None:
                 self.logger.info("Skipping (no relevant keywords)")
                 return None
 
             # Parse page
-            return self._parse_page(url, country, response.text, depth)
+            return self._parse_page(url, country, html, depth)
 
         except Exception as e:
             self.logger.error(f"Failed to crawl {url}: {str(e)}")
             return None
 
+    def _fetch(self, url: str) -> Optional[str]:
+        """
+        Download a page body, streaming it in chunks.
+
+        Keywords are checked as chunks arrive. A page with no keyword in
+        its first relevance_scan_bytes is abandoned right there; relevant
+        pages are read up to the max_page_bytes cap.
+
+        Args:
+            url: URL to fetch
+
+        Returns:
+            Decoded HTML, or None if no keyword appears within the scan window
+        """
+        # Rate limiting
+        self._wait_for_host(url)
+
+        max_bytes = self.config['crawling'].get('max_page_bytes', _DEFAULT_MAX_PAGE_BYTES)
+        scan_bytes = self.config['crawling'].get('relevance_scan_bytes', _DEFAULT_RELEVANCE_SCAN_BYTES)
+
+        response = self.session.get(
+            url,
+            timeout=self.config['crawling']['timeout'],
+            stream=True
+        )
+        try:
+            response.raise_for_status()
+
+            try:
+                decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')('replace')
+            except LookupError:
+                decoder = codecs.getincrementaldecoder('utf-8')('replace')
+
+            parts = []
+            size = 0
+            relevant = False
+            tail = ''
+
+            for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+                text = decoder.decode(chunk[:max_bytes - size])
+                parts.append(text)
+                size += len(chunk)
+
+                if not relevant:
+                    relevant = self._is_relevant(tail + text)
+                    if not relevant and size >= scan_bytes:
+                        return None  # Abandon: nothing relevant up front
+                    tail = text[-self._keyword_overlap:] if self._keyword_overlap else ''
+
+                if size >= max_bytes:
+                    break
+            else:
+                parts.append(decoder.decode(b'', final=True))
+
+            return ''.join(parts) if relevant else None
+
+        finally:
+            response.close()
+
+    def _wait_for_host(self, url: str):
+        """
+        Sleep until this URL's host may be requested again.
+
+        Each host gets its own slot clock, so different hosts are fetched
+        concurrently while requests to one host stay delay_between_requests
+        apart. Slots are reserved under a lock, so parallel workers queue
+        up behind each other instead of all firing at once.
+
+        Args:
+            url: URL about to be fetched
+        """
+        delay = self.config['crawling']['delay_between_requests']
+        if delay <= 0:
+            return
+
+        host = urlsplit(url).netloc.lower()
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_fetch_at.get(host, 0.0))
+            self._next_fetch_at[host] = slot + delay
+
+        if slot > now:
+            time.sleep(slot - now)
+
     def _parse_page(self, url: str, country: str, html: str, depth: int) -> CrawledPage:
         """
         Parse HTML and extract structured data.
@@ -172,24 +421,25 @@ class CrawlerEngine:
         Returns:
             CrawledPage object
         """
-        soup = BeautifulSoup(html, 'lxml')
+        doc = lxml.html.document_fromstring(
+            html.encode('utf-8', 'replace'),
+            parser=_HTML_PARSER
+        )
 
         # Remove noise
-        for element in soup(['script', 'style', 'nav', 'header', 'footer']):
-            element.decompose()
+        for element in doc.xpath(_NOISE_XPATH):
+            element.drop_tree()
 
         # Extract data
-        title = soup.title.string.strip() if soup.title else 'No Title'
-        content_text = soup.get_text(separator='\n', strip=True)
+        title_element = doc.find('.//title')
+        title = title_element.text_content().strip() if title_element is not None else 'No Title'
+        content_text = self._extract_text(doc, _MAX_CONTENT_CHARS)
 
         # Extract breadcrumbs
-        breadcrumbs = self._extract_breadcrumbs(soup)
-
-        # Extract links
-        links = self._extract_links(soup, url)
+        breadcrumbs = self._extract_breadcrumbs(doc)
 
-        # Extract attachments
-        attachments = self._extract_attachments(soup, url)
+        # Extract links and attachments (single pass over anchors)
+        links, attachments = self._extract_anchors(doc, url)
 
         # Build metadata
         metadata = {
@@ -203,57 +453,179 @@ class CrawlerEngine:
             url=url,
             country=country,
             title=title,
-            content=content_text[:10000],  # Limit size
+            content=content_text,
             metadata=metadata
         )
 
-    def _extract_breadcrumbs(self, soup: BeautifulSoup) -> List[str]:
+    def _extract_text(self, doc: lxml.html.HtmlElement, limit: int) -> str:
+        """
+        Extract visible text, one stripped string per line, up to a limit.
+
+        Stops walking the tree once enough text is collected rather than
+        building the full page text and slicing it.
+        """
+        parts = []
+        size = 0
+
+        for text in doc.itertext():
+            text = text.strip()
+            if not text:
+                continue
+            parts.append(text)
+            size += len(text) + 1  # Including the newline separator
+            if size >= limit:
+                break
+
+        return '\n'.join(parts)[:limit]
+
+    def _extract_breadcrumbs(self, doc: lxml.html.HtmlElement) -> List[str]:
         """Extract page breadcrumbs"""
-        for selector in ['nav[aria-label*="breadcrumb"] a', '.breadcrumb a']:
-            elements = soup.select(selector)
+        for xpath in _BREADCRUMB_XPATHS:
+            elements = doc.xpath(xpath)
             if elements:
-                return [e.get_text(strip=True) for e in elements]
+                return [e.text_content().strip() for e in elements]
         return []
 
-    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
-        """Extract same-domain links"""
-        links = []
-        base_domain = urlparse(base_url).netloc
+    def _extract_anchors(self, doc: lxml.html.HtmlElement,
+                         base_url: str) -> Tuple[List[str], List[Dict]]:
+        """
+        Extract same-domain links and document attachments in one pass.
 
-        for link in soup.find_all('a', href=True):
-            full_url = urljoin(base_url, link['href'])
-            if urlparse(full_url).netloc == base_domain:
-                links.append(full_url)
+        Links are canonicalized and deduplicated. Anchors pointing at a
+        download extension are reported as attachments instead of being
+        queued as pages.
 
-        return links
+        Args:
+            doc: Parsed page
+            base_url: Page URL for resolving relative hrefs
 
-    def _extract_attachments(self, soup: BeautifulSoup, base_url: str) -> List[Dict]:
-        """Extract document attachments (PDFs, etc.)"""
+        Returns:
+            Tuple of (links, attachments)
+        """
+        links = []
         attachments = []
-        extensions = self.config['download_extensions']
+        seen = set()
 
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            if any(ext in href.lower() for ext in extensions):
+        base_domain = urlsplit(base_url).netloc.lower()
+        attachment_re = self._attachment_re
+        visited = self.visited
+
+        for anchor in doc.iter('a'):
+            href = anchor.get('href')
+            if href is None:
+                continue
+            full_url = urljoin(base_url, href)
+
+            match = attachment_re.search(href)
+            if match:
                 attachments.append({
-                    'type': href.split('.')[-1].lower(),
-                    'url': urljoin(base_url, href),
-                    'title': link.get_text(strip=True) or 'Document'
+                    'type': match.group(0)[1:].rstrip('?#').lower(),
+                    'url': full_url,
+                    'title': anchor.text_content().strip() or 'Document'
                 })
+                continue
+
+            # Split once: filter off-site links before canonicalizing
+            parts = urlsplit(full_url)
+            if parts.netloc.lower() != base_domain:
+                continue
+
+            full_url = self._canonicalize_parts(parts)
+            if full_url in seen or full_url in visited:
+                continue
+            seen.add(full_url)
+            links.append(full_url)
 
-        return attachments
+        return links, attachments
 
     def _is_relevant(self, text: str) -> bool:
         """Check if page contains relevant keywords"""
-        text_lower = text.lower()
-        return any(kw in text_lower for kw in self.config['keywords'])
+        # Case-insensitive search stops at the first hit without copying the body
+        return self._relevance_re.search(text) is not None
 
     def _should_exclude(self, url: str) -> bool:
         """Check if URL should be excluded"""
-        url_lower = url.lower()
-        return any(pattern in url_lower for pattern in self.config['exclude_patterns'])
+        return self._exclude_re.search(url) is not None
+
+    @staticmethod
+    def _canonicalize(url: str) -> str:
+        """
+        Normalize a URL so trivially different spellings of a page match.
+
+        Drops the fragment, lowercases scheme and host, sorts query
+        parameters and removes the trailing slash from non-root paths.
+        """
+        return CrawlerEngine._canonicalize_parts(urlsplit(url))
+
+    @staticmethod
+    def _canonicalize_parts(parts) -> str:
+        """Canonicalize an already split URL (see _canonicalize)"""
+        path = parts.path
+        if len(path) > 1 and path.endswith('/'):
+            path = path.rstrip('/') or '/'
+        query = parts.query
+        if query:
+            query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+        return urlunsplit((
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            path or '/',
+            query,
+            ''
+        ))
+
+    @staticmethod
+    def _compile_any(patterns) -> re.Pattern:
+        """Compile patterns into one case-insensitive alternation"""
+        patterns = list(patterns)
+        if not patterns:
+            return re.compile(r'(?!)')  # Never matches
+        return re.compile('|'.join(patterns), re.IGNORECASE)
+
+    @staticmethod
+    def _trie_pattern(words) -> str:
+        """
+        Build a regex matching any of the words, factored by common prefix.
+
+        e.g. ['permit', 'permanent', 'visa'] -> (?:perm(?:anent|it)|visa)
+
+        Args:
+            words: Literal words to match
+
+        Returns:
+            Regex pattern string
+        """
+        trie: Dict = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}  # End of word
+
+        def build(node: Dict) -> str:
+            ends_here = '' in node
+            branches = [re.escape(char) + build(child)
+                        for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            if ends_here:
+                # A shorter word ends here; the longer continuation is optional
+                body = '(?:' + body + ')?'
+            return body
+
+        return build(trie)
 
     def reset(self):
-        """Reset crawl state for new crawl"""
+        """
+        Reset per-country crawl state for a new crawl.
+
+        Only the frontier and visited/queued sets are cleared. The HTTP
+        session and the compiled keyword/exclude/attachment matchers are
+        kept, so the next country starts with warm connections. They are
+        built from the config in __init__, so a changed config needs a
+        new engine.
+        """
         self.visited.clear()
         self.to_visit.clear()
+        self.enqueued.clear()
@@ -11,13 +11,38 @@ Supports two crawler engines:
 - Browser (Playwright) - Slower but bypasses bot detection
 """
 
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Callable, Optional
 
-from services.crawler.engine import CrawlerEngine
+from services.crawler.engine import CrawlerEngine, get_shared_session
 from services.crawler.browser_engine import BrowserCrawlerEngine
 from services.crawler.repository import CrawlerRepository
 from shared.logger import setup_logger
-from shared.service_config import get_service_config
+from shared.service_config import get_service_config, register_config_cache
+
+# Upper bound on countries crawled at the same time
+_MAX_PARALLEL_COUNTRIES = 8
+
+
+@lru_cache(maxsize=1)
+def _load_crawler_config() -> Dict:
+    """
+    Load crawler configuration once per process.
+
+    Building it reads YAML and several database settings, so it is
+    memoized. Callers must copy the result before mutating it.
+    """
+    return get_service_config().get_crawler_config()
+
+
+def clear_config_cache():
+    """Drop the memoized crawler config (call after settings change)"""
+    _load_crawler_config.cache_clear()
+
+
+register_config_cache(clear_config_cache)
 
 
 class CrawlerService:
@@ -37,9 +62,9 @@ class CrawlerService:
         """
         self.logger = setup_logger('crawler_service')
 
-        # Load configuration from centralized system (DB > YAML defaults)
-        config_loader = get_service_config()
-        self.config = config_loader.get_crawler_config()
+        # Load configuration from centralized system (DB > YAML defaults);
+        # memoized, so copy before applying per-service overrides
+        self.config = copy.deepcopy(_load_crawler_config())
 
         # Override mode if specified
         if mode:
@@ -82,24 +107,37 @@ class CrawlerService:
         """
         Crawl all configured countries.
 
+        In simple mode countries are crawled in parallel, each with its
+        own engine (countries are different sites with independent state).
+        Browser mode stays sequential - one browser at a time.
+
         Returns:
             List of crawl results for each country
         """
+        countries = self.config.get('countries') or list(get_service_config().get_countries().values())
+        if not countries:
+            return []
+
+        if self.mode == 'simple':
+            with ThreadPoolExecutor(max_workers=min(_MAX_PARALLEL_COUNTRIES, len(countries))) as pool:
+                return list(pool.map(self._crawl_country_isolated, countries))
+
         results = []
 
-        for country in self.config['countries']:
+        for country in countries:
             result = self.crawl_country(
                 country['name'],
                 country['seed_urls']
             )
             results.append(result)
 
-            # Reset engine for next country (only for simple mode)
-            if self.mode == 'simple' and self.engine:
-                self.engine.reset()
-
         return results
 
+    def _crawl_country_isolated(self, country: Dict) -> Dict:
+        """Crawl one country with a fresh engine (safe to run in parallel)"""
+        engine = CrawlerEngine(self.config, self.repo)
+        return engine.crawl_country(country['name'], country['seed_urls'])
+
     def get_crawled_pages(self, country: Optional[str] = None) -> List:
         """
         Get crawled pages.
@@ -121,15 +159,11 @@ class CrawlerService:
         Returns:
             Statistics dictionary
         """
-        pages = self.repo.get_all_pages()
-
-        # Count by country
-        by_country = {}
-        for page in pages:
-            by_country[page.country] = by_country.get(page.country, 0) + 1
+        # Count by country (aggregated by the database)
+        by_country = self.repo.count_pages_by_country()
 
         return {
-            'total_pages': len(pages),
+            'total_pages': sum(by_country.values()),
             'by_country': by_country,
             'countries': list(by_country.keys())
         }
@@ -223,23 +257,29 @@ class CrawlerController:
         """
         Validate URLs are accessible.
 
+        URLs are checked in parallel over the shared crawler session.
+
         Args:
             urls: List of URLs to check
 
         Returns:
             Dict of {url: is_valid}
         """
-        results = {}
-        import requests
+        if not urls:
+            return {}
 
-        for url in urls:
-            try:
-                response = requests.head(url, timeout=5)
-                results[url] = response.status_code < 400
-            except:
-                results[url] = False
+        session = get_shared_session(self.service.config['crawling']['user_agent'])
 
-        return results
+        def check(url: str) -> bool:
+            try:
+                response = session.head(url, timeout=5)
+                return response.status_code < 400
+            except Exception:
+                return False
+
+        # Each check is independent network I/O
+        with ThreadPoolExecutor(max_workers=min(32, len(urls))) as pool:
+            return dict(zip(urls, pool.map(check, urls)))
 
     def get_statistics(self) -> Dict:
         """Get crawling statistics"""
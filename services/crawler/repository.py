@@ -5,7 +5,7 @@ Handles data flow between the engine and the database.
 The engine doesn't know about the database, only the repository.
 """
 
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Set
 from shared.database import Database
 from shared.models import CrawledPage
 
@@ -47,6 +47,18 @@ class CrawlerRepository:
             metadata=page.metadata
         )
 
+    def save_pages_batch(self, pages: List[CrawledPage]) -> int:
+        """
+        Store many crawled pages in a single transaction.
+
+        Args:
+            pages: CrawledPage models
+
+        Returns:
+            Number of pages saved
+        """
+        return self.db.save_crawled_pages_batch(pages)
+
     def get_pages_by_country(self, country: str) -> List[CrawledPage]:
         """
         Get all pages for a country.
@@ -59,6 +71,18 @@ class CrawlerRepository:
         """
         return self.db.get_pages(country=country)
 
+    def iter_pages(self, country: Optional[str] = None) -> Iterator[CrawledPage]:
+        """
+        Stream pages one at a time (for single-pass processing).
+
+        Args:
+            country: Optional country filter
+
+        Yields:
+            CrawledPage objects
+        """
+        return self.db.iter_pages(country=country)
+
     def url_exists(self, url: str) -> bool:
         """
         Check if URL has been crawled.
@@ -69,8 +93,28 @@ class CrawlerRepository:
         Returns:
             True if URL exists in database
         """
-        pages = self.db.get_pages()
-        return any(p.url == url for p in pages)
+        return self.db.url_exists(url)
+
+    def get_crawled_urls(self, country: Optional[str] = None) -> Set[str]:
+        """
+        Get all crawled URLs, loaded once for bulk de-duplication.
+
+        Args:
+            country: Optional country filter
+
+        Returns:
+            Set of URLs
+        """
+        return self.db.get_crawled_urls(country=country)
+
+    def count_pages_by_country(self) -> Dict[str, int]:
+        """
+        Count crawled pages per country without loading them.
+
+        Returns:
+            Dict of {country: page_count}
+        """
+        return self.db.count_pages_by_country()
 
     def get_all_pages(self) -> List[CrawledPage]:
         """Get all crawled pages"""
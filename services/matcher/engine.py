@@ -5,11 +5,21 @@ Core business logic for matching users to visas.
 Pure matching algorithms - no database access.
 """
 
-from typing import List, Dict
-from shared.models import Visa, UserProfile, MatchResult
+import hashlib
+import heapq
+import json
+from collections import OrderedDict
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from shared.models import Visa, UserProfile, MatchResult, MatchRow
 from shared.logger import setup_logger
 from services.matcher.repository import MatcherRepository
-from services.matcher.scorer import EligibilityScorer
+from services.matcher.scorer import EligibilityScorer, UserFeatures
+
+# Scored match lists kept per engine, keyed by (profile hash, country)
+_MATCH_CACHE_SIZE = 32
 
 
 class MatcherEngine:
@@ -41,66 +51,130 @@ class MatcherEngine:
         self.logger = setup_logger('matcher_engine')
         self.scorer = EligibilityScorer(config)
 
-    def match_user_to_visas(self, user_profile: Dict, country: str = None) -> List[Dict]:
+        # LRU of unsorted match lists; each entry is tagged with the visa
+        # data version it was computed from so new visas invalidate it
+        self._match_cache: OrderedDict = OrderedDict()
+
+    def match_user_to_visas(self, user_profile: Dict, country: str = None,
+                            top_k: Optional[int] = None) -> List[Dict]:
         """
         Match a user to all available visas.
 
         Args:
             user_profile: User profile dictionary
             country: Optional country filter
+            top_k: Only return the best K matches (partial selection
+                instead of a full sort)
 
         Returns:
             List of match results sorted by score
         """
-        # Get visas from repository
-        visas = self.repo.get_all_visas_as_dicts(country)
+        matches = self._get_matches(user_profile, country)
+
+        # Sort by score (highest first); dicts are built only for the results
+        if top_k is not None:
+            ranked = heapq.nlargest(top_k, matches, key=lambda x: x.eligibility_score)
+        else:
+            ranked = sorted(matches, key=lambda x: x.eligibility_score, reverse=True)
+        return [m.to_dict() for m in ranked]
+
+    def _get_matches(self, user_profile: Dict, country: Optional[str]) -> List[MatchRow]:
+        """
+        Score the user against all visas, reusing a cached result when the
+        same profile and country were matched against unchanged visa data.
+
+        Args:
+            user_profile: User profile dictionary
+            country: Optional country filter
 
-        if not visas:
+        Returns:
+            Unsorted list of compact match records (shared with the cache)
+        """
+        profile_json = json.dumps(user_profile, sort_keys=True, default=str)
+        key = (hashlib.blake2b(profile_json.encode('utf-8'), digest_size=16).hexdigest(), country)
+        data_version = self.repo.get_data_version()
+
+        cached = self._match_cache.get(key)
+        if cached is not None and cached[0] == data_version:
+            self._match_cache.move_to_end(key)
+            return cached[1]
+
+        # Target countries depend only on the user, so build the set once
+        target_countries = frozenset(
+            c.lower() for c in user_profile.get('target_countries') or ()
+        ) or None
+
+        # Columnar visa data, cached by the repository until visas change
+        matrix, visas = self.repo.get_visa_matrix(country)
+        visa_count = len(visas)
+        if not visa_count:
             self.logger.warning("No visas found for matching")
             return []
 
-        self.logger.info(f"Matching user against {len(visas)} visas...")
+        scores = None
+        if matrix is not None:
+            keep = np.ones(visa_count, dtype=bool)
+            if target_countries is not None:
+                keep = np.isin(matrix['country'], list(target_countries))
+            indices = np.flatnonzero(keep)
+            candidates = [visas[i] for i in indices]
+            try:
+                rows = {name: column[indices] for name, column in matrix.items()}
+                scores = self.scorer.calculate_scores_vectorized(user_profile, rows).tolist()
+            except (TypeError, ValueError, AttributeError):
+                pass
+        else:
+            candidates = [
+                visa for visa in visas
+                if target_countries is None or visa['country'].lower() in target_countries
+            ]
+
+        # Without vectorized scores each visa is scored on its own
+        if scores is None:
+            scores = [None] * len(candidates)
 
-        # Match each visa
-        matches = []
-        for visa in visas:
-            # Filter by target countries if specified
-            if user_profile.get('target_countries'):
-                target_countries_lower = [c.lower() for c in user_profile['target_countries']]
-                if visa['country'].lower() not in target_countries_lower:
-                    continue
+        features = self.scorer.precompute_user(user_profile)
+        matches = [
+            self._match_single_visa(user_profile, visa, score, features)
+            for visa, score in zip(candidates, scores)
+        ]
 
-            match = self._match_single_visa(user_profile, visa)
-            matches.append(match)
+        self.logger.info(f"Matched user against {visa_count} visas: {len(matches)} matches")
 
-        # Sort by score (highest first)
-        matches.sort(key=lambda x: x['eligibility_score'], reverse=True)
+        self._match_cache[key] = (data_version, matches)
+        if len(self._match_cache) > _MATCH_CACHE_SIZE:
+            self._match_cache.popitem(last=False)
 
-        self.logger.info(f"Found {len(matches)} matches")
         return matches
 
-    def _match_single_visa(self, user_profile: Dict, visa: Dict) -> Dict:
+    def clear_cache(self):
+        """Drop cached match results (e.g. after changing scoring config)"""
+        self._match_cache.clear()
+
+    def _match_single_visa(self, user_profile: Dict, visa: Dict,
+                           score: Optional[float] = None,
+                           features: Optional[UserFeatures] = None) -> MatchRow:
         """
         Match user to a single visa.
 
         Args:
             user_profile: User profile
             visa: Visa dictionary
+            score: Precomputed eligibility score (calculated if omitted)
+            features: Precomputed user features (from scorer.precompute_user)
 
         Returns:
-            Match result dictionary
+            Match record (use to_dict() for the result dictionary)
         """
-        # Calculate score
-        score = self.scorer.calculate_total_score(
-            user_profile,
-            visa.get('requirements', {})
-        )
+        if features is None:
+            features = self.scorer.precompute_user(user_profile)
 
-        # Identify gaps
-        gaps = self.scorer.identify_gaps(
-            user_profile,
-            visa.get('requirements', {})
-        )
+        # Calculate score and identify gaps (one pass when not precomputed)
+        requirements = visa.get('requirements', {})
+        if score is None:
+            score, gaps = self.scorer.score_and_gaps(user_profile, requirements, features)
+        else:
+            gaps = self.scorer.identify_gaps(user_profile, requirements, features, score)
 
         # Determine eligibility and match level
         thresholds = self.config['thresholds']
@@ -115,19 +189,19 @@ class MatcherEngine:
             eligible = False
             match_level = "low"
 
-        return {
-            'visa_type': visa['visa_type'],
-            'country': visa['country'],
-            'category': visa.get('category', 'unknown'),
-            'eligibility_score': round(score, 1),
-            'match_level': match_level,
-            'eligible': eligible,
-            'gaps': gaps,
-            'fees': visa.get('fees', {}),
-            'processing_time': visa.get('processing_time'),
-            'language': visa.get('language'),
-            'source_urls': visa.get('source_urls', [])
-        }
+        return MatchRow(
+            visa_type=visa['visa_type'],
+            country=visa['country'],
+            category=visa.get('category', 'unknown'),
+            eligibility_score=round(score, 1),
+            match_level=match_level,
+            eligible=eligible,
+            gaps=gaps,
+            fees=visa.get('fees', {}),
+            processing_time=visa.get('processing_time'),
+            language=visa.get('language'),
+            source_urls=visa.get('source_urls', [])
+        )
 
     def get_top_matches(self, user_profile: Dict, country: str = None, limit: int = 10) -> List[Dict]:
         """
@@ -141,8 +215,7 @@ class MatcherEngine:
         Returns:
             Top matches
         """
-        all_matches = self.match_user_to_visas(user_profile, country)
-        return all_matches[:limit]
+        return self.match_user_to_visas(user_profile, country, top_k=limit)
 
     def get_eligible_visas(self, user_profile: Dict, country: str = None) -> List[Dict]:
         """
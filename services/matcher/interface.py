@@ -8,12 +8,28 @@ EXTERIOR Interface: Used by UI, CLI, and external systems
 """
 
 import json
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Dict, Callable, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from services.matcher.engine import MatcherEngine
 from services.matcher.repository import MatcherRepository
 from shared.logger import setup_logger
-from shared.service_config import get_service_config
+from shared.service_config import get_service_config, register_config_cache
+
+# Matches handed to on_match per call (one UI update per batch)
+_MATCH_CALLBACK_BATCH = 32
+
+# Profile validation rules, built once at import instead of per call
+_REQUIRED_PROFILE_FIELDS = ('age', 'nationality', 'education')
+_VALID_EDUCATION_LEVELS = ('secondary', 'diploma', 'bachelors', 'masters', 'phd')
+_VALID_EDUCATION_SET = frozenset(_VALID_EDUCATION_LEVELS)
+_EDUCATION_ERROR = f"Education must be one of: {', '.join(_VALID_EDUCATION_LEVELS)}"
 
 
 class MatcherService:
@@ -119,7 +135,7 @@ class MatcherController:
             user_profile: User profile dictionary
             country: Optional country filter
             on_start: Called when starting (total_visas)
-            on_match: Called for each match (match_result)
+            on_match: Called with batches of up to 32 matches (list of match_result)
             on_complete: Called when complete (all_matches)
             on_error: Called on error (error_message)
 
@@ -127,8 +143,8 @@ class MatcherController:
             List of match results
         """
         try:
-            # Get visa count
-            visa_count = self.service.repo.get_visa_count()
+            # Get visa count (for the requested country only)
+            visa_count = self.service.repo.get_visa_count(country)
 
             if visa_count == 0:
                 if on_error:
@@ -142,10 +158,10 @@ class MatcherController:
             # Match
             matches = self.service.match_user(user_profile, country)
 
-            # Notify for each match
+            # Notify in batches so the UI re-renders once per batch, not per match
             if on_match:
-                for match in matches:
-                    on_match(match)
+                for i in range(0, len(matches), _MATCH_CALLBACK_BATCH):
+                    on_match(matches[i:i + _MATCH_CALLBACK_BATCH])
 
             # Notify complete
             if on_complete:
@@ -170,6 +186,8 @@ class MatcherController:
             User profile dictionary
         """
         try:
+            if orjson is not None:
+                return orjson.loads(Path(filepath).read_bytes())
             with open(filepath, 'r') as f:
                 return json.load(f)
         except Exception as e:
@@ -185,8 +203,13 @@ class MatcherController:
             filepath: Output file path
         """
         try:
-            with open(filepath, 'w') as f:
-                json.dump(matches, f, indent=2)
+            if orjson is not None:
+                # Serializes straight to bytes, no intermediate str
+                data = orjson.dumps(matches, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                Path(filepath).write_bytes(data)
+            else:
+                with open(filepath, 'w') as f:
+                    json.dump(matches, f, indent=2)
             self.logger.info(f"Saved results to {filepath}")
         except Exception as e:
             self.logger.error(f"Failed to save results: {e}")
@@ -204,9 +227,8 @@ class MatcherController:
         """
         errors = []
 
-        required_fields = ['age', 'nationality', 'education']
-        for field in required_fields:
-            if field not in profile or not profile[field]:
+        for field in _REQUIRED_PROFILE_FIELDS:
+            if not profile.get(field):
                 errors.append(f"Missing required field: {field}")
 
         # Validate age
@@ -220,9 +242,8 @@ class MatcherController:
 
         # Validate education level
         if 'education' in profile:
-            valid_levels = ['secondary', 'diploma', 'bachelors', 'masters', 'phd']
-            if profile['education'].lower() not in valid_levels:
-                errors.append(f"Education must be one of: {', '.join(valid_levels)}")
+            if profile['education'].lower() not in _VALID_EDUCATION_SET:
+                errors.append(_EDUCATION_ERROR)
 
         return {
             'valid': len(errors) == 0,
@@ -240,6 +261,25 @@ class MatcherController:
 
 # Convenience functions for quick access
 
+@lru_cache(maxsize=1)
+def _get_service() -> MatcherService:
+    """
+    Shared service for the convenience functions.
+
+    Reuses the loaded config, database handle and cached visa matrix
+    across calls instead of rebuilding them every time.
+    """
+    return MatcherService()
+
+
+def clear_service_cache():
+    """Drop the shared matcher service (run by clear_config_caches after settings change)"""
+    _get_service.cache_clear()
+
+
+register_config_cache(clear_service_cache)
+
+
 def match_user(user_profile: Dict, country: str = None) -> List[Dict]:
     """
     Quick function to match a user to visas.
@@ -251,8 +291,7 @@ def match_user(user_profile: Dict, country: str = None) -> List[Dict]:
     Returns:
         List of match results
     """
-    service = MatcherService()
-    return service.match_user(user_profile, country)
+    return _get_service().match_user(user_profile, country)
 
 
 def get_top_matches(user_profile: Dict, limit: int = 10) -> List[Dict]:
@@ -266,5 +305,4 @@ def get_top_matches(user_profile: Dict, limit: int = 10) -> List[Dict]:
     Returns:
         Top matches
     """
-    service = MatcherService()
-    return service.get_top_matches(user_profile, limit=limit)
+    return _get_service().get_top_matches(user_profile, limit=limit)
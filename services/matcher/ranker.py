@@ -3,28 +3,56 @@ Visa Ranker
 Ranks visa options based on eligibility scores
 """
 
-from typing import List, Dict
-from services.matcher.scorer import EligibilityScorer
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from services.matcher.scorer import EligibilityScorer, UserFeatures
 from shared.logger import setup_logger
 
+
+def _rank_order(scores: np.ndarray, limit: Optional[int] = None) -> np.ndarray:
+    """
+    Indices of visas by rounded score, highest first (stable on ties).
+
+    With a limit only the top entries are selected (O(N) partition) and
+    sorted, so match dicts are built just for those.
+    """
+    keys = -np.round(scores, 1)
+    if limit is None or limit >= len(keys):
+        return np.argsort(keys, kind='stable')
+    if limit <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    # Everything scoring at least the limit-th best, in original order
+    cutoff = np.partition(keys, limit - 1)[limit - 1]
+    candidates = np.flatnonzero(keys <= cutoff)
+    return candidates[np.argsort(keys[candidates], kind='stable')][:limit]
+
+
 class VisaRanker:
     def __init__(self, config):
         self.config = config
         self.scorer = EligibilityScorer(config)
         self.logger = setup_logger('ranker')
 
-    def match_user_to_visa(self, user_profile: Dict, visa: Dict) -> Dict:
-        """Match a user profile to a specific visa"""
-        score = self.scorer.calculate_total_score(
-            user_profile,
-            visa.get('requirements', {})
-        )
+    def match_user_to_visa(self, user_profile: Dict, visa: Dict,
+                           score: Optional[float] = None,
+                           features: Optional[UserFeatures] = None) -> Dict:
+        """Match a user profile to a specific visa (score/features may be precomputed)"""
+        if features is None:
+            features = self.scorer.precompute_user(user_profile)
 
-        gaps = self.scorer.identify_gaps(
-            user_profile,
-            visa.get('requirements', {})
-        )
+        requirements = visa.get('requirements', {})
+        if score is None:
+            score, gaps = self.scorer.score_and_gaps(user_profile, requirements, features)
+        else:
+            gaps = self.scorer.identify_gaps(user_profile, requirements, features, score)
+
+        return self._build_match(visa, score, gaps)
 
+    def _build_match(self, visa: Dict, score: float, gaps: List[str]) -> Dict:
+        """Build the match result for a scored visa"""
         # Determine eligibility
         thresholds = self.config['thresholds']
         if score >= thresholds['high_match'] and not gaps:
@@ -51,22 +79,56 @@ class VisaRanker:
             'source_urls': visa.get('source_urls', [])
         }
 
-    def rank_all_visas(self, user_profile: Dict, all_visas: List[Dict]) -> List[Dict]:
-        """Rank all visas for a user"""
+    def rank_all_visas(self, user_profile: Dict, all_visas: List[Dict],
+                       limit: Optional[int] = None) -> List[Dict]:
+        """Rank all visas for a user (only the best `limit` if given)"""
         self.logger.info(f"Matching user profile against {len(all_visas)} visas...")
 
-        matches = []
-        for visa in all_visas:
-            # Filter by target countries if specified
-            if user_profile.get('target_countries'):
-                if visa['country'].lower() not in [c.lower() for c in user_profile['target_countries']]:
-                    continue
-
-            match = self.match_user_to_visa(user_profile, visa)
-            matches.append(match)
+        visas = self._filter_target_countries(user_profile, all_visas)
 
-        # Sort by score (highest first)
-        matches.sort(key=lambda x: x['eligibility_score'], reverse=True)
+        # Score every visa at once, then rank by score (highest first)
+        scores = self.scorer.calculate_total_scores(
+            user_profile,
+            [visa.get('requirements', {}) for visa in visas]
+        )
+        order = _rank_order(scores, limit)
+        features = self.scorer.precompute_user(user_profile)
+        matches = [
+            self.match_user_to_visa(user_profile, visas[i], float(scores[i]), features)
+            for i in order
+        ]
 
         self.logger.info(f"Found {len(matches)} matches")
         return matches
+
+    def get_eligible_visas(self, user_profile: Dict, all_visas: List[Dict]) -> List[Dict]:
+        """
+        Rank only the visas the user is eligible for.
+
+        Eligibility needs zero gaps, so each visa is dropped at its first
+        failed requirement without scoring the rest.
+        """
+        features = self.scorer.precompute_user(user_profile)
+
+        matches = []
+        for visa in self._filter_target_countries(user_profile, all_visas):
+            score, gaps = self.scorer.score_and_gaps(
+                user_profile, visa.get('requirements', {}), features, eligible_only=True
+            )
+            if gaps:
+                continue
+            match = self._build_match(visa, score, gaps)
+            if match['eligible']:
+                matches.append(match)
+
+        matches.sort(key=lambda x: x['eligibility_score'], reverse=True)
+        return matches
+
+    @staticmethod
+    def _filter_target_countries(user_profile: Dict, all_visas: List[Dict]) -> List[Dict]:
+        """Keep visas in the user's target countries (all visas if none set)"""
+        # Lowercased once, not per visa
+        target_countries = frozenset(c.lower() for c in user_profile.get('target_countries') or ())
+        if target_countries:
+            return [v for v in all_visas if v['country'].lower() in target_countries]
+        return list(all_visas)
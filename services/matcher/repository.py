@@ -5,9 +5,24 @@ Handles data flow for the matcher service.
 Gets visas, saves match results.
 """
 
-from typing import List, Optional
+import time
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
 from shared.database import Database
 from shared.models import Visa, UserProfile
+from services.matcher.scorer import build_requirement_matrix
+
+# Seconds a visa count is reused (throttles repeated UI polling)
+_COUNT_TTL = 1.0
+
+
+@lru_cache(maxsize=1)
+def _shared_database() -> Database:
+    """Database handle shared by all matcher repositories in this process"""
+    return Database()
 
 
 class MatcherRepository:
@@ -21,7 +36,12 @@ class MatcherRepository:
     """
 
     def __init__(self):
-        self.db = Database()
+        # Reused across service instances, so connections stay warm
+        self.db = _shared_database()
+        # {country: (data_version, matrix, visa dicts)}
+        self._matrix_cache: Dict[Optional[str], tuple] = {}
+        # {country: (expires_at, count)}
+        self._count_cache: Dict[Optional[str], Tuple[float, int]] = {}
 
     def get_visas(self, country: Optional[str] = None) -> List[Visa]:
         """
@@ -35,9 +55,30 @@ class MatcherRepository:
         """
         return self.db.get_visas(country=country)
 
-    def get_visa_count(self) -> int:
-        """Get total number of visas"""
-        return len(self.db.get_visas())
+    def get_visa_count(self, country: Optional[str] = None) -> int:
+        """
+        Get number of visas (counted by the database).
+
+        The count is reused for _COUNT_TTL seconds.
+
+        Args:
+            country: Optional country filter
+
+        Returns:
+            Visa count
+        """
+        now = time.monotonic()
+        cached = self._count_cache.get(country)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        count = self.db.count_visas(country=country)
+        self._count_cache[country] = (now + _COUNT_TTL, count)
+        return count
+
+    def get_data_version(self) -> Tuple[int, int]:
+        """Fingerprint of current visa data (changes when visas change)"""
+        return self.db.get_visa_data_version()
 
     def save_match_result(self, user_profile: dict, visa: Visa, score: float,
                          eligible: bool, gaps: List[str]) -> int:
@@ -62,11 +103,53 @@ class MatcherRepository:
         """
         Get visas as dictionaries (for backward compatibility).
 
+        Served from the dicts cached with the visa matrix, so visas are only
+        re-read and re-serialized when the visa data changes.
+
+        Args:
+            country: Optional country filter
+
+        Returns:
+            List of visa dictionaries (shallow copies of the cached ones)
+        """
+        _, visas = self.get_visa_matrix(country)
+        return [dict(visa) for visa in visas]
+
+    def iter_visas_as_dicts(self, country: Optional[str] = None) -> Iterator[dict]:
+        """
+        Stream visas as dictionaries without building the full list.
+
+        Args:
+            country: Optional country filter
+
+        Yields:
+            Visa dictionaries
+        """
+        for visa in self.db.iter_visas(country=country):
+            yield visa.to_dict()
+
+    def get_visa_matrix(self, country: Optional[str] = None) -> Tuple[Optional[Dict[str, np.ndarray]], List[dict]]:
+        """
+        Get visas as a columnar requirement matrix for vectorized scoring.
+
+        Built once and cached until the visa data version changes.
+
         Args:
             country: Optional country filter
 
         Returns:
-            List of visa dictionaries
+            Tuple of (matrix, visa dicts). The matrix also has a lowercased
+            'country' column and is None if requirements are not numeric.
         """
-        visas = self.get_visas(country)
-        return [visa.to_dict() for visa in visas]
+        data_version = self.get_data_version()
+        cached = self._matrix_cache.get(country)
+        if cached is not None and cached[0] == data_version:
+            return cached[1], cached[2]
+
+        visas = list(self.iter_visas_as_dicts(country))
+        matrix = build_requirement_matrix([visa.get('requirements', {}) for visa in visas])
+        if matrix is not None:
+            matrix['country'] = np.array([visa['country'].lower() for visa in visas], dtype=object)
+
+        self._matrix_cache[country] = (data_version, matrix, visas)
+        return matrix, visas
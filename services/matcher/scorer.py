@@ -3,13 +3,47 @@ Eligibility Scorer
 Calculates match score between user profile and visa requirements
 """
 
-from typing import Dict
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
 from shared.logger import setup_logger
 
+# User fields the scorer reads, resolved once per match instead of per visa
+UserFeatures = namedtuple('UserFeatures', ['age', 'education', 'edu_level', 'experience_years'])
+
+
 class EligibilityScorer:
     def __init__(self, config):
         self.config = config
         self.logger = setup_logger('scorer')
+        self._edu_levels = config['education_levels']
+
+        # Every failed requirement lowers the score only if all weights count
+        weights = config['scoring']
+        self._perfect_means_no_gaps = min(
+            weights['age_match'], weights['education_match'], weights['experience_match']
+        ) > 0
+
+    def precompute_user(self, user_profile: Dict) -> UserFeatures:
+        """
+        Resolve the user fields used for scoring (education level lookup,
+        lowercasing) once, so per-visa scoring only compares numbers.
+
+        Args:
+            user_profile: User profile dictionary
+
+        Returns:
+            UserFeatures for the profile
+        """
+        education = user_profile['education']
+        return UserFeatures(
+            age=user_profile['age'],
+            education=education,
+            edu_level=self._edu_levels.get(education.lower(), 0) if education else 0,
+            experience_years=user_profile.get('experience_years', 0)
+        )
 
     def score_age(self, user_age: int, requirement: Dict) -> float:
         """Score age requirement match"""
@@ -32,9 +66,14 @@ class EligibilityScorer:
         if not requirement:
             return 1.0
 
-        levels = self.config['education_levels']
-        user_level = levels.get(user_education.lower(), 0)
-        required_level = levels.get(requirement.lower(), 0)
+        return self._score_education_level(self._edu_levels.get(user_education.lower(), 0), requirement)
+
+    def _score_education_level(self, user_level: int, requirement: str) -> float:
+        """Score education match for an already-resolved user level"""
+        if not requirement:
+            return 1.0
+
+        required_level = self._edu_levels.get(requirement.lower(), 0)
 
         if user_level >= required_level:
             return 1.0
@@ -53,23 +92,25 @@ class EligibilityScorer:
             # Partial score based on percentage
             return user_years / required_years if required_years > 0 else 0
 
-    def calculate_total_score(self, user_profile: Dict, visa_requirements: Dict) -> float:
-        """Calculate overall eligibility score"""
+    def calculate_total_score(self, user_profile: Dict, visa_requirements: Dict,
+                              features: Optional[UserFeatures] = None) -> float:
+        """Calculate overall eligibility score (features from precompute_user)"""
         weights = self.config['scoring']
+        user = features or self.precompute_user(user_profile)
 
         # Score each component
         age_score = self.score_age(
-            user_profile['age'],
+            user.age,
             visa_requirements.get('age', {})
         )
 
-        education_score = self.score_education(
-            user_profile['education'],
+        education_score = self._score_education_level(
+            user.edu_level,
             visa_requirements.get('education')
         )
 
         experience_score = self.score_experience(
-            user_profile.get('experience_years', 0),
+            user.experience_years,
             visa_requirements.get('experience_years', 0)
         )
 
@@ -83,30 +124,225 @@ class EligibilityScorer:
 
         return total_score * 100  # Convert to percentage
 
-    def identify_gaps(self, user_profile: Dict, visa_requirements: Dict) -> list:
-        """Identify what user is missing"""
+    def calculate_total_scores(self, user_profile: Dict, requirements: List[Dict]) -> np.ndarray:
+        """
+        Score one user against many visas at once.
+
+        Results match calculate_total_score row for row. Falls back to the
+        per-visa path when a requirement is not numeric.
+
+        Args:
+            user_profile: User profile dictionary
+            requirements: Visa requirement dicts (one per visa)
+
+        Returns:
+            Array of scores (percentages), aligned with requirements
+        """
+        matrix = build_requirement_matrix(requirements)
+        if matrix is not None:
+            try:
+                return self.calculate_scores_vectorized(user_profile, matrix)
+            except (TypeError, ValueError, AttributeError):
+                pass
+        return np.array(
+            [self.calculate_total_score(user_profile, req) for req in requirements],
+            dtype=float
+        )
+
+    def calculate_scores_vectorized(self, user_profile: Dict, matrix: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Score one user against a columnar requirement matrix.
+
+        Args:
+            user_profile: User profile dictionary
+            matrix: Columns from build_requirement_matrix
+
+        Returns:
+            Array of scores (percentages), one per matrix row
+        """
+        weights = self.config['scoring']
+        levels = self._edu_levels
+
+        user = self.precompute_user(user_profile)
+        user_age = float(user.age)
+        user_level = float(user.edu_level)
+        user_exp = float(user.experience_years)
+
+        # Education names map to levels once per distinct value
+        names, inverse = np.unique(matrix['education'], return_inverse=True)
+        edu_level = np.array(
+            [levels.get(name, 0) if name else -np.inf for name in names],
+            dtype=float
+        )[inverse]
+        # Missing experience requirement is always met
+        exp_years = np.where(np.isnan(matrix['experience_years']), -np.inf, matrix['experience_years'])
+
+        # NaN bounds compare False, so missing bounds never fail
+        age_scores = np.where(
+            (user_age < matrix['min_age']) | (user_age > matrix['max_age']), 0.0, 1.0
+        )
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            education_scores = np.where(
+                user_level >= edu_level, 1.0,
+                np.where(edu_level > 0, np.maximum(0, user_level / edu_level), 0.0)
+            )
+            experience_scores = np.where(
+                user_exp >= exp_years, 1.0,
+                np.where(exp_years > 0, user_exp / exp_years, 0.0)
+            )
+
+        scores = np.stack([age_scores, education_scores, experience_scores], axis=1)
+        weight_vector = np.array(
+            [weights['age_match'], weights['education_match'], weights['experience_match']],
+            dtype=float
+        )
+        return scores.dot(weight_vector) / weight_vector.sum() * 100  # Convert to percentage
+
+    def identify_gaps(self, user_profile: Dict, visa_requirements: Dict,
+                      features: Optional[UserFeatures] = None,
+                      score: Optional[float] = None) -> list:
+        """
+        Identify what user is missing (features from precompute_user).
+
+        A precomputed perfect score means no requirement failed, so the
+        checks and message formatting are skipped.
+        """
+        if score == 100 and self._perfect_means_no_gaps:
+            return []
+
         gaps = []
+        user = features or self.precompute_user(user_profile)
 
         # Check age
         age_req = visa_requirements.get('age', {})
         if age_req:
-            if age_req.get('min') and user_profile['age'] < age_req['min']:
+            if age_req.get('min') and user.age < age_req['min']:
                 gaps.append(f"Age too low (need {age_req['min']}+)")
-            if age_req.get('max') and user_profile['age'] > age_req['max']:
+            if age_req.get('max') and user.age > age_req['max']:
                 gaps.append(f"Age too high (max {age_req['max']})")
 
         # Check education
         edu_req = visa_requirements.get('education')
         if edu_req:
-            levels = self.config['education_levels']
-            if levels.get(user_profile['education'].lower(), 0) < levels.get(edu_req.lower(), 0):
-                gaps.append(f"Need {edu_req} degree (have {user_profile['education']})")
+            if user.edu_level < self._edu_levels.get(edu_req.lower(), 0):
+                gaps.append(f"Need {edu_req} degree (have {user.education})")
 
         # Check experience
         exp_req = visa_requirements.get('experience_years')
         if exp_req:
-            user_exp = user_profile.get('experience_years', 0)
+            user_exp = user.experience_years
             if user_exp < exp_req:
                 gaps.append(f"Need {exp_req} years experience (have {user_exp})")
 
         return gaps
+
+    def score_and_gaps(self, user_profile: Dict, visa_requirements: Dict,
+                       features: Optional[UserFeatures] = None,
+                       eligible_only: bool = False) -> Tuple[float, list]:
+        """
+        Score a visa and identify gaps in a single pass over its requirements.
+
+        Same results as calculate_total_score plus identify_gaps, but each
+        requirement is looked up and compared once.
+
+        Args:
+            user_profile: User profile dictionary
+            visa_requirements: Visa requirements dictionary
+            features: Precomputed user features (from precompute_user)
+            eligible_only: Caller only keeps eligible visas - stop at the
+                first failed requirement and return (0.0, gaps so far)
+
+        Returns:
+            Tuple of (score percentage, list of gaps)
+        """
+        weights = self.config['scoring']
+        user = features or self.precompute_user(user_profile)
+        gaps = []
+
+        # Age
+        age_score = 1.0
+        age_req = visa_requirements.get('age', {})
+        if age_req:
+            min_age = age_req.get('min')
+            max_age = age_req.get('max')
+            if min_age and user.age < min_age:
+                age_score = 0.0
+                gaps.append(f"Age too low (need {min_age}+)")
+            if max_age and user.age > max_age:
+                age_score = 0.0
+                gaps.append(f"Age too high (max {max_age})")
+
+        # Any gap makes the visa ineligible, so the rest can be skipped
+        if eligible_only and gaps:
+            return 0.0, gaps
+
+        # Education
+        education_score = 1.0
+        edu_req = visa_requirements.get('education')
+        if edu_req:
+            required_level = self._edu_levels.get(edu_req.lower(), 0)
+            if user.edu_level < required_level:
+                education_score = max(0, user.edu_level / required_level)
+                gaps.append(f"Need {edu_req} degree (have {user.education})")
+
+        if eligible_only and gaps:
+            return 0.0, gaps
+
+        # Experience
+        experience_score = 1.0
+        exp_req = visa_requirements.get('experience_years')
+        if exp_req and not user.experience_years >= exp_req:
+            experience_score = user.experience_years / exp_req if exp_req > 0 else 0
+            gaps.append(f"Need {exp_req} years experience (have {user.experience_years})")
+
+        total_weight = weights['age_match'] + weights['education_match'] + weights['experience_match']
+        total_score = (
+            age_score * weights['age_match'] +
+            education_score * weights['education_match'] +
+            experience_score * weights['experience_match']
+        ) / total_weight
+
+        return total_score * 100, gaps  # Score as percentage
+
+
+def build_requirement_matrix(requirements: List[Dict]) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Lift visa requirements into columnar arrays for vectorized scoring.
+
+    Missing (or falsy) numeric requirements are NaN and a missing education
+    requirement is an empty string, mirroring the per-visa scorer.
+
+    Args:
+        requirements: Visa requirement dicts (one per visa)
+
+    Returns:
+        Dict of min_age, max_age, experience_years and education arrays,
+        or None if a requirement is not numeric
+    """
+    n = len(requirements)
+    min_age = np.full(n, np.nan)
+    max_age = np.full(n, np.nan)
+    experience_years = np.full(n, np.nan)
+    education = []
+
+    try:
+        for i, req in enumerate(requirements):
+            age = req.get('age') or {}
+            if age.get('min'):
+                min_age[i] = age['min']
+            if age.get('max'):
+                max_age[i] = age['max']
+            if req.get('experience_years'):
+                experience_years[i] = req['experience_years']
+            edu = req.get('education')
+            education.append(edu.lower() if edu else '')
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+    return {
+        'min_age': min_age,
+        'max_age': max_age,
+        'experience_years': experience_years,
+        'education': np.array(education, dtype=object),
+    }
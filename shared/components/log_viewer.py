@@ -3,8 +3,15 @@ Log Viewer Component
 Reusable live log display
 """
 
+import time
+from collections import deque
+
 import streamlit as st
 
+# Minimum seconds between re-renders while messages arrive in a burst
+_RENDER_INTERVAL = 0.1
+
+
 class LogViewer:
     """Manages live log display with auto-scrolling"""
 
@@ -14,10 +21,23 @@ class LogViewer:
         self.container = st.expander("📋 Live Logs", expanded=expanded)
         self.log_area = self.container.empty()
 
+        # Visible tail, trimmed on append instead of re-sliced per render
+        self._visible = deque(maxlen=max_lines)
+        self._dirty = False
+        self._last_render = 0.0
+
     def add(self, message: str):
-        """Add a log message"""
+        """
+        Add a log message.
+
+        Renders at most once per _RENDER_INTERVAL; call flush() before a
+        long blocking step so the latest lines are shown.
+        """
         self.logs.append(message)
-        self._update_display()
+        self._visible.append(message)
+        self._dirty = True
+        if time.monotonic() - self._last_render >= _RENDER_INTERVAL:
+            self._update_display()
 
     def add_info(self, message: str):
         """Add info log"""
@@ -38,13 +58,20 @@ class LogViewer:
     def clear(self):
         """Clear all logs"""
         self.logs = []
+        self._visible.clear()
         self._update_display()
 
+    def flush(self):
+        """Render any messages added since the last render"""
+        if self._dirty:
+            self._update_display()
+
     def _update_display(self):
         """Update the display with latest logs"""
         # Show only last N lines
-        visible_logs = self.logs[-self.max_lines:]
-        self.log_area.code('\n'.join(visible_logs))
+        self.log_area.code('\n'.join(self._visible))
+        self._dirty = False
+        self._last_render = time.monotonic()
 
     def get_logs(self):
         """Get all logs as list"""
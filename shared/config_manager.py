@@ -3,13 +3,121 @@ Unified Configuration Manager
 Reads settings from: .env > Database > YAML (in priority order)
 """
 
+import copy
+import json
 import os
-import yaml
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Optional, Dict
-from dotenv import load_dotenv
 import sqlite3
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Seconds before re-checking a database file that was missing
+_DB_MISSING_RECHECK = 1.0
+
+# Settings SQL, kept as fixed strings so sqlite3's statement cache reuses them
+_SQL_UPSERT = """
+    INSERT OR REPLACE INTO settings (key, value, type, updated_at)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+"""
+_SQL_SELECT_ALL = "SELECT key, value, type FROM settings"
+_SQL_SELECT_BY_CATEGORY = "SELECT key, value, type FROM settings WHERE category = ?"
+
+# Marks a lookup that has not been memoized yet (None is a valid result)
+_MISS = object()
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialize a setting to JSON text (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(value)
+
+
+def _to_bool(value: str) -> bool:
+    """Convert a stored boolean setting"""
+    return value.lower() in ('true', '1', 'yes')
+
+
+# Converters for stored setting types; other types ('string', 'json') stay text
+_DB_CONVERTERS = {
+    'integer': int,
+    'float': float,
+    'boolean': _to_bool
+}
+
+# Boolean spellings accepted in environment values (matched lowercase)
+_BOOL_STRINGS = {
+    'true': True, 'yes': True, '1': True,
+    'false': False, 'no': False, '0': False
+}
+
+# .env files already loaded into os.environ: {path: mtime}
+_DOTENV_MTIMES: Dict[Path, float] = {}
+
+# Parsed YAML files shared by all ConfigManager instances: {path: (mtime, data)}
+_YAML_FILE_CACHE: Dict[Path, tuple] = {}
+
+
+def _load_yaml_file(yaml_path: Path) -> Any:
+    """Parse a YAML file, reusing the cached result until the file changes"""
+    mtime = yaml_path.stat().st_mtime
+    cached = _YAML_FILE_CACHE.get(yaml_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    # Imported here so callers that only read env/DB settings skip the cost
+    import yaml
+    try:
+        from yaml import CSafeLoader as YamlLoader  # libyaml C parser
+    except ImportError:
+        from yaml import SafeLoader as YamlLoader
+
+    with open(yaml_path, 'r') as f:
+        data = yaml.load(f, Loader=YamlLoader)
+    _YAML_FILE_CACHE[yaml_path] = (mtime, data)
+    return data
+
+
+def load_yaml_file(yaml_path) -> Any:
+    """
+    Parse a YAML file with the shared loader (libyaml when available)
+
+    Parses are cached per file until it changes; the caller gets its
+    own copy and may mutate it.
+
+    Args:
+        yaml_path: Path to the YAML file
+
+    Returns:
+        Parsed YAML data
+    """
+    return copy.deepcopy(_load_yaml_file(Path(yaml_path)))
+
+
+def _load_dotenv_once(env_file: Path):
+    """Load a .env file into os.environ unless this version is already loaded"""
+    try:
+        mtime = env_file.stat().st_mtime
+    except OSError:
+        return
+
+    key = env_file.resolve()
+    if _DOTENV_MTIMES.get(key) == mtime:
+        return
+
+    from dotenv import load_dotenv
+    load_dotenv(env_file)
+    _DOTENV_MTIMES[key] = mtime
+
 
 class ConfigManager:
     """
@@ -20,14 +128,96 @@ class ConfigManager:
     def __init__(self, db_path: str = "data/immigration.db"):
         self.db_path = Path(db_path)
 
-        # Load .env file if exists
-        env_file = Path('.env')
-        if env_file.exists():
-            load_dotenv(env_file)
+        # Load .env file if exists (once per process, again only if it changed)
+        _load_dotenv_once(Path('.env'))
 
         # Cache for database settings
         self._db_cache = None
+        # Keys of cached settings stored as JSON text (lists/dicts)
+        self._db_json_keys = set()
+        # When the database file was last found missing (None = present)
+        self._db_missing_at = None
+        # PRAGMA data_version when the cache was loaded; it changes when
+        # another connection (another instance or process) commits
+        self._db_data_version = None
         self._yaml_cache = {}
+        # Resolved dotted-key lookups: {(service, key): value}
+        self._yaml_lookup_cache = {}
+        # Environment variable name per config key ('llm.provider' -> 'LLM_PROVIDER')
+        self._env_key_cache: Dict[str, str] = {}
+
+        # One connection for the manager's lifetime, opened on first use
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the shared connection (autocommit), opening it if needed"""
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=256
+            )
+            conn.row_factory = sqlite3.Row
+            # WAL lets settings reads run alongside a write; NORMAL skips
+            # the fsync on every commit (safe with WAL)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA cache_size = -64000")  # 64 MB page cache
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA mmap_size = 134217728")  # 128 MB
+            self._conn = conn
+        return self._conn
+
+    def _query_one(self, sql: str, params: tuple = ()) -> Optional[sqlite3.Row]:
+        """Run a query on the shared connection and return the first row"""
+        with self._lock:
+            return self._connect().execute(sql, params).fetchone()
+
+    def _query_all(self, sql: str, params: tuple = ()) -> list:
+        """Run a query on the shared connection and return all rows"""
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def _write(self, sql: str, params: tuple = ()):
+        """Run a write statement on the shared connection (autocommitted)"""
+        with self._lock:
+            self._connect().execute(sql, params)
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several writes into one transaction (a single commit)
+
+        Nested batches join the outermost one. Other threads wait until
+        the batch finishes.
+
+        Usage:
+            with config.batch():
+                config.set('llm.provider', 'openai')
+                config.set('llm.model', 'gpt-4o-mini')
+        """
+        with self._lock:
+            conn = self._connect()
+            if conn.in_transaction:
+                yield
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self):
+        """Close the shared connection (reopened on next use)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
     def get(self, key: str, default: Any = None, service: Optional[str] = None) -> Any:
         """
@@ -41,8 +231,11 @@ class ConfigManager:
         Returns:
             Configuration value
         """
-        # 1. Check environment variables (highest priority)
-        env_key = key.upper().replace('.', '_')
+        # 1. Check environment variables (highest priority); read live, since
+        # the UI can set API keys in os.environ at runtime
+        env_key = self._env_key_cache.get(key)
+        if env_key is None:
+            env_key = self._env_key_cache[key] = key.upper().replace('.', '_')
         env_value = os.getenv(env_key)
         if env_value is not None:
             return self._convert_type(env_value)
@@ -72,28 +265,31 @@ class ConfigManager:
             True if successful
         """
         try:
-            # Determine type
-            value_type = type(value).__name__
-            if value_type == 'int':
-                value_type = 'integer'
-            elif value_type == 'float':
-                value_type = 'float'
-            elif value_type == 'bool':
-                value_type = 'boolean'
-            else:
-                value_type = 'string'
-
             # Save to database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            self._write(_SQL_UPSERT, (key, str(value), self._db_type(value)))
+
+            # Clear cache
+            self._db_cache = None
+            return True
+
+        except Exception:
+            return False
 
-            cursor.execute("""
-                INSERT OR REPLACE INTO settings (key, value, type, updated_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            """, (key, str(value), value_type))
+    def set_many(self, items: Dict[str, Any]) -> bool:
+        """
+        Save several settings to database in one statement and commit
+
+        Args:
+            items: Dict of {key: value}
+
+        Returns:
+            True if successful
+        """
+        rows = [(key, str(value), self._db_type(value)) for key, value in items.items()]
 
-            conn.commit()
-            conn.close()
+        try:
+            with self.batch():
+                self._connect().executemany(_SQL_UPSERT, rows)
 
             # Clear cache
             self._db_cache = None
@@ -102,6 +298,18 @@ class ConfigManager:
         except Exception:
             return False
 
+    @staticmethod
+    def _db_type(value: Any) -> str:
+        """Stored type name for a setting value"""
+        value_type = type(value).__name__
+        if value_type == 'int':
+            return 'integer'
+        elif value_type == 'float':
+            return 'float'
+        elif value_type == 'bool':
+            return 'boolean'
+        return 'string'
+
     def get_all(self, category: Optional[str] = None) -> Dict[str, Any]:
         """
         Get all settings, optionally filtered by category
@@ -116,26 +324,17 @@ class ConfigManager:
 
         # Get from database
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
             if category:
-                cursor.execute("""
-                    SELECT key, value, type FROM settings
-                    WHERE category = ?
-                """, (category,))
+                rows = self._query_all(_SQL_SELECT_BY_CATEGORY, (category,))
             else:
-                cursor.execute("SELECT key, value, type FROM settings")
+                rows = self._query_all(_SQL_SELECT_ALL)
 
-            for row in cursor.fetchall():
+            for row in rows:
                 settings[row['key']] = self._convert_type_from_db(
                     row['value'],
                     row['type']
                 )
 
-            conn.close()
-
         except Exception:
             pass
 
@@ -170,35 +369,134 @@ class ConfigManager:
         db_key = f'{provider}.api_key'
         return self.get(db_key)
 
-    def _get_from_db(self, key: str) -> Optional[Any]:
-        """Get value from database"""
+    def _get_many(self, defaults: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resolve several keys in one pass (same priority as get, no YAML)
+
+        Args:
+            defaults: Dict of {key: default value}
+
+        Returns:
+            Dict of {key: resolved value}
+        """
+        env = os.environ
+        db_cache = self._load_db_cache()
+        env_keys = self._env_key_cache
+        values = {}
+
+        for key, default in defaults.items():
+            env_key = env_keys.get(key)
+            if env_key is None:
+                env_key = env_keys[key] = key.upper().replace('.', '_')
+
+            value = env.get(env_key)
+            if value is not None:
+                values[key] = self._convert_type(value)
+                continue
+
+            value = db_cache.get(key)
+            values[key] = default if value is None else value
+
+        return values
+
+    def _read_data_version(self) -> Optional[int]:
+        """Get the connection's PRAGMA data_version (None if unavailable)"""
         try:
-            # Load cache if needed
-            if self._db_cache is None and self.db_path.exists():
-                self._db_cache = {}
-                conn = sqlite3.connect(self.db_path)
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
+            return self._query_one("PRAGMA data_version")[0]
+        except sqlite3.Error:
+            return None
 
-                cursor.execute("SELECT key, value, type FROM settings")
-                for row in cursor.fetchall():
-                    self._db_cache[row['key']] = self._convert_type_from_db(
-                        row['value'],
-                        row['type']
-                    )
+    def _load_db_cache(self) -> Dict[str, Any]:
+        """
+        Get the database settings, loading them on first use
 
-                conn.close()
+        Writes through this instance drop the cache directly; writes made
+        by other instances or processes are detected via PRAGMA data_version.
+        """
+        db_cache = self._db_cache
+        if db_cache is not None:
+            missing_at = self._db_missing_at
+            if missing_at is not None:
+                # A missing database is remembered briefly so env/YAML-only
+                # lookups don't stat the file on every call
+                if time.monotonic() - missing_at < _DB_MISSING_RECHECK:
+                    return db_cache
+            elif self._read_data_version() == self._db_data_version:
+                return db_cache
 
-            if self._db_cache and key in self._db_cache:
-                return self._db_cache[key]
+        try:
+            if not self.db_path.exists():
+                self._db_missing_at = time.monotonic()
+                self._db_json_keys = set()
+                self._db_cache = {}
+            else:
+                self._db_missing_at = None
+                # Read before the rows, so a commit in between forces a reload
+                data_version = self._read_data_version()
+                rows = self._query_all(_SQL_SELECT_ALL)
+
+                db_cache = {}
+                json_keys = set()
+                converters = _DB_CONVERTERS
+                for key, value, value_type in rows:
+                    convert = converters.get(value_type)
+                    db_cache[key] = value if convert is None else convert(value)
+                    if value_type == 'json':
+                        json_keys.add(key)
+
+                self._db_json_keys = json_keys
+                self._db_cache = db_cache
+                self._db_data_version = data_version
 
         except Exception:
             pass
 
-        return None
+        return self._db_cache or {}
+
+    def _get_from_db(self, key: str) -> Optional[Any]:
+        """Get value from database"""
+        return self._load_db_cache().get(key)
+
+    def _get_json_from_db(self, key: str) -> Optional[Any]:
+        """
+        Get a JSON setting from the database cache
+
+        The cache holds the raw JSON text, so every call returns a fresh
+        object that callers are free to mutate. Decoding it (orjson when
+        installed) is cheaper than deep-copying a parsed value.
+
+        Args:
+            key: Setting key
+
+        Returns:
+            Decoded value, or None if the key is not a JSON setting
+        """
+        db_cache = self._load_db_cache()
+        if key not in self._db_json_keys:
+            return None
+
+        try:
+            return _json_loads(db_cache[key])
+        except (KeyError, TypeError, ValueError):
+            return None
 
     def _get_from_yaml(self, service: str, key: str) -> Optional[Any]:
-        """Get value from service YAML config"""
+        """
+        Get value from service YAML config (memoized per service and key)
+
+        Parsed YAML is shared by every ConfigManager in the process, so
+        dicts and lists are returned as copies - callers may mutate them.
+        """
+        value = self._yaml_lookup_cache.get((service, key), _MISS)
+        if value is _MISS:
+            value = self._lookup_yaml(service, key)
+            self._yaml_lookup_cache[(service, key)] = value
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
+
+    def _lookup_yaml(self, service: str, key: str) -> Optional[Any]:
+        """Walk a dotted key through the service YAML config"""
         try:
             # Load cache if needed
             if service not in self._yaml_cache:
@@ -210,8 +508,7 @@ class ConfigManager:
                         yaml_path = Path("config.yaml")
 
                 if yaml_path.exists():
-                    with open(yaml_path, 'r') as f:
-                        self._yaml_cache[service] = yaml.safe_load(f)
+                    self._yaml_cache[service] = _load_yaml_file(yaml_path)
                 else:
                     self._yaml_cache[service] = {}
 
@@ -232,10 +529,18 @@ class ConfigManager:
 
     def _convert_type(self, value: str) -> Any:
         """Convert string value to appropriate type"""
-        if value.lower() in ('true', 'yes', '1'):
-            return True
-        if value.lower() in ('false', 'no', '0'):
-            return False
+        flag = _BOOL_STRINGS.get(value.lower())
+        if flag is not None:
+            return flag
+
+        if value.isdecimal():
+            return int(value)
+
+        # Plain text (model names, URLs, API keys) can't parse as a number,
+        # so skip the failing int()/float() call
+        head = value.lstrip()[:1]
+        if not head.isdecimal() and head not in ('+', '-', '.'):
+            return value
 
         try:
             if '.' in value:
@@ -246,33 +551,39 @@ class ConfigManager:
 
     def _convert_type_from_db(self, value: str, value_type: str) -> Any:
         """Convert database value to appropriate type"""
-        if value_type == 'integer':
-            return int(value)
-        elif value_type == 'float':
-            return float(value)
-        elif value_type == 'boolean':
-            return value.lower() in ('true', '1', 'yes')
-        else:
-            return value
+        convert = _DB_CONVERTERS.get(value_type)
+        return value if convert is None else convert(value)
 
     def get_llm_config(self) -> Dict[str, Any]:
         """Get complete LLM configuration"""
-        provider = self.get('llm.provider', 'openrouter')
+        values = self._get_many({
+            'llm.provider': 'openrouter',
+            'llm.model': 'google/gemini-2.0-flash-001:free',
+            'llm.temperature': 0.3,
+            'llm.max_tokens': 2000
+        })
+        provider = values['llm.provider']
 
         return {
             'provider': provider,
-            'model': self.get('llm.model', 'google/gemini-2.0-flash-001:free'),
-            'temperature': self.get('llm.temperature', 0.3),
-            'max_tokens': self.get('llm.max_tokens', 2000),
+            'model': values['llm.model'],
+            'temperature': values['llm.temperature'],
+            'max_tokens': values['llm.max_tokens'],
             'api_key': self.get_api_key(provider)
         }
 
     def get_crawler_config(self) -> Dict[str, Any]:
         """Get crawler configuration"""
+        values = self._get_many({
+            'crawler.delay': 2.0,
+            'crawler.max_pages': 50,
+            'crawler.max_depth': 3
+        })
+
         return {
-            'delay': self.get('crawler.delay', 2.0),
-            'max_pages': self.get('crawler.max_pages', 50),
-            'max_depth': self.get('crawler.max_depth', 3)
+            'delay': values['crawler.delay'],
+            'max_pages': values['crawler.max_pages'],
+            'max_depth': values['crawler.max_depth']
         }
 
     # === Country Management ===
@@ -285,25 +596,9 @@ class ConfigManager:
             Dict of country configs with country code as key
         """
         # Try database first
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT value FROM settings
-                WHERE key = 'countries' AND type = 'json'
-            """)
-
-            row = cursor.fetchone()
-            conn.close()
-
-            if row:
-                import json
-                return json.loads(row['value'])
-
-        except Exception:
-            pass
+        countries = self._get_json_from_db('countries')
+        if countries is not None:
+            return countries
 
         # Fallback to YAML
         return self._get_from_yaml('global', 'countries') or {}
@@ -319,17 +614,7 @@ class ConfigManager:
             True if successful
         """
         try:
-            import json
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                INSERT OR REPLACE INTO settings (key, value, type, updated_at)
-                VALUES ('countries', ?, 'json', CURRENT_TIMESTAMP)
-            """, (json.dumps(countries),))
-
-            conn.commit()
-            conn.close()
+            self._write(_SQL_UPSERT, ('countries', _json_dumps(countries), 'json'))
 
             self._db_cache = None
             return True
@@ -351,14 +636,33 @@ class ConfigManager:
         Returns:
             True if successful
         """
-        countries = self.get_countries()
-
-        countries[code] = {
+        return self.add_countries([{
+            'code': code,
             'name': name,
-            'code': code.upper(),
             'base_url': base_url,
             'seed_urls': seed_urls
-        }
+        }])
+
+    def add_countries(self, new_countries: list) -> bool:
+        """
+        Add or update several country configurations with a single save
+
+        Args:
+            new_countries: List of {code, name, base_url, seed_urls} dicts
+
+        Returns:
+            True if successful
+        """
+        countries = self.get_countries()
+
+        for country in new_countries:
+            code = country['code']
+            countries[code] = {
+                'name': country['name'],
+                'code': code.upper(),
+                'base_url': country['base_url'],
+                'seed_urls': country['seed_urls']
+            }
 
         return self.set_countries(countries)
 
@@ -386,25 +690,9 @@ class ConfigManager:
             List configuration
         """
         # Try database first
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT value FROM settings
-                WHERE key = ? AND type = 'json'
-            """, (key,))
-
-            row = cursor.fetchone()
-            conn.close()
-
-            if row:
-                import json
-                return json.loads(row['value'])
-
-        except Exception:
-            pass
+        db_value = self._get_json_from_db(key)
+        if db_value is not None:
+            return db_value
 
         # Fallback to YAML
         yaml_value = self._get_from_yaml('global', key)
@@ -425,17 +713,7 @@ class ConfigManager:
             True if successful
         """
         try:
-            import json
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                INSERT OR REPLACE INTO settings (key, value, type, updated_at)
-                VALUES (?, ?, 'json', CURRENT_TIMESTAMP)
-            """, (key, json.dumps(value)))
-
-            conn.commit()
-            conn.close()
+            self._write(_SQL_UPSERT, (key, _json_dumps(value), 'json'))
 
             self._db_cache = None
             return True
@@ -459,25 +737,9 @@ class ConfigManager:
             Dict configuration
         """
         # Try database first
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT value FROM settings
-                WHERE key = ? AND type = 'json'
-            """, (key,))
-
-            row = cursor.fetchone()
-            conn.close()
-
-            if row:
-                import json
-                return json.loads(row['value'])
-
-        except Exception:
-            pass
+        db_value = self._get_json_from_db(key)
+        if db_value is not None:
+            return db_value
 
         # Fallback to YAML
         yaml_value = self._get_from_yaml(service, key)
@@ -498,17 +760,7 @@ class ConfigManager:
             True if successful
         """
         try:
-            import json
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                INSERT OR REPLACE INTO settings (key, value, type, updated_at)
-                VALUES (?, ?, 'json', CURRENT_TIMESTAMP)
-            """, (key, json.dumps(value)))
-
-            conn.commit()
-            conn.close()
+            self._write(_SQL_UPSERT, (key, _json_dumps(value), 'json'))
 
             self._db_cache = None
             return True
@@ -583,16 +835,11 @@ class ConfigManager:
             True if successful
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute("DELETE FROM settings")
-
-            conn.commit()
-            conn.close()
+            self._write("DELETE FROM settings")
 
             self._db_cache = None
             self._yaml_cache = {}
+            self._yaml_lookup_cache = {}
             return True
 
         except Exception as e:
@@ -602,10 +849,14 @@ class ConfigManager:
 
 # Global instance
 _config = None
+_config_lock = threading.Lock()
+
 
 def get_config() -> ConfigManager:
-    """Get global config instance"""
+    """Get global config instance (created once, even if threads race)"""
     global _config
     if _config is None:
-        _config = ConfigManager()
+        with _config_lock:
+            if _config is None:
+                _config = ConfigManager()
     return _config
@@ -5,40 +5,205 @@ Handles all data storage with version tracking
 
 import sqlite3
 import json
-from datetime import datetime
+import threading
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Iterator, List, Dict, Optional, Set, Tuple
 from contextlib import contextmanager
-from shared.models import Visa, CrawledPage, load_visas_from_rows, load_pages_from_rows
+import numpy as np
+from shared.models import (
+    Visa, CrawledPage, PageRow, load_visas_from_rows, load_pages_from_rows,
+    encode_page_content, decode_page_content
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_json(value: Any) -> str:
+    """Serialize a column value to JSON text (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(value)
+
+
+_loads_json = orjson.loads if orjson is not None else json.loads
+
+
+# Bound parameters per statement (SQLite's lowest default limit)
+_MAX_SQL_VARIABLES = 999
+
+# Hot read statements, kept prepared by the connection's statement cache
+_SQL_PAGE_CONTENT = "SELECT content FROM crawled_pages WHERE id = ?"
+_SQL_URL_EXISTS = "SELECT 1 FROM crawled_pages WHERE url = ? LIMIT 1"
+_SQL_LATEST_VISAS = """
+    SELECT * FROM visas
+    WHERE is_latest = 1
+    ORDER BY created_at DESC
+"""
+_SQL_LATEST_VISAS_BY_COUNTRY = """
+    SELECT * FROM visas
+    WHERE is_latest = 1 AND country = ?
+    ORDER BY created_at DESC
+"""
+_SQL_VISA_HISTORY = """
+    SELECT * FROM visas
+    WHERE visa_type = ? AND country = ?
+    ORDER BY version DESC
+"""
+_SQL_CLIENT = "SELECT * FROM clients WHERE id = ?"
+_SQL_CLIENT_CHECKS = """
+    SELECT ec.*, v.visa_type, v.country
+    FROM eligibility_checks ec
+    JOIN visas v ON ec.visa_id = v.id
+    WHERE ec.client_id = ?
+    ORDER BY ec.check_date DESC
+"""
+_SQL_EMBEDDING = """
+    SELECT embedding, dtype FROM embeddings
+    WHERE visa_id = ? AND model_name = ?
+"""
+_SQL_STATS_COUNTERS = "SELECT key, value FROM stats_cache"
+_SQL_STATS_COUNTRIES = """
+    SELECT COALESCE(
+        NULLIF((SELECT COUNT(DISTINCT country) FROM visas WHERE is_latest = 1), 0),
+        (SELECT COUNT(DISTINCT country) FROM crawled_pages WHERE is_latest = 1)
+    )
+"""
+
+
+def _encode_embedding(embedding) -> Tuple[bytes, str]:
+    """
+    Prepare an embedding for storage.
+
+    Arrays are stored as float16 (half the size, ample precision for
+    cosine similarity); raw bytes are taken as float32, as before.
+
+    Returns:
+        (blob, dtype name)
+    """
+    if isinstance(embedding, np.ndarray):
+        return embedding.astype(np.float16).tobytes(), 'float16'
+    return bytes(embedding), 'float32'
+
+
+def _insert_many(cursor: sqlite3.Cursor, insert_sql: str, row_sql: str, rows: List[tuple]):
+    """
+    Insert rows with multi-row VALUES statements.
+
+    Each statement carries as many rows as fit under the parameter limit;
+    the remainder goes through executemany with the single-row statement.
+
+    Args:
+        cursor: Cursor inside the caller's transaction
+        insert_sql: Statement up to and including VALUES
+        row_sql: Placeholder group for one row, e.g. "(?, ?, ?)"
+        rows: Parameter tuples, all the same length
+    """
+    if not rows:
+        return
+
+    per_statement = max(1, _MAX_SQL_VARIABLES // len(rows[0]))
+    full = len(rows) - len(rows) % per_statement
+
+    if full:
+        sql = insert_sql + ', '.join([row_sql] * per_statement)
+        for start in range(0, full, per_statement):
+            cursor.execute(sql, list(chain.from_iterable(rows[start:start + per_statement])))
+
+    if full < len(rows):
+        cursor.executemany(insert_sql + row_sql, rows[full:])
 
 
 class Database:
     """SQLite database with versioning for visa data"""
 
+    # Max URLs per IN (...) clause, well under SQLite's variable limit
+    BATCH_CHUNK_SIZE = 500
+
+    # Primary source URL of every latest visa (NULLs excluded so NOT IN works)
+    _CLASSIFIED_URLS_SQL = """
+        SELECT json_extract(v.source_urls, '$[0]') FROM visas v
+        WHERE v.is_latest = 1 AND json_extract(v.source_urls, '$[0]') IS NOT NULL
+    """
+
+    # Visa columns stored as JSON text
+    _VISA_JSON_COLUMNS = (
+        'requirements', 'fees', 'documents_required',
+        'timeline_stages', 'cost_breakdown', 'source_urls'
+    )
+
+    # Row counters kept in stats_cache by triggers: {key: (table, latest_only)}
+    _STATS_COUNTERS = {
+        'pages_crawled': ('crawled_pages', True),
+        'visas_total': ('visas', True),
+        'general_content': ('general_content', True),
+        'clients': ('clients', False),
+        'checks_performed': ('eligibility_checks', False),
+        'embeddings': ('embeddings', False),
+    }
+
     def __init__(self, db_path: str = "data/immigration.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection per thread, opened on first use and reused
+        self._local = threading.local()
         self.init_database()
 
-    @contextmanager
-    def get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        # Room for every distinct statement, so hot queries are never re-prepared
+        conn = sqlite3.connect(self.db_path, cached_statements=256)
         conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        # Safe with WAL; skips the fsync on every commit
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA cache_size = -64000")  # 64 MB page cache
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA mmap_size = 268435456")  # 256 MB
+        return conn
+
+    @contextmanager
+    def get_connection(self, mode: str = 'r'):
+        """
+        Context manager for this thread's database connection.
+
+        The connection stays open between calls (keeping SQLite's page
+        cache warm); each block is committed, or rolled back on error.
+
+        Args:
+            mode: 'rw' takes the write lock up front (BEGIN IMMEDIATE), so
+                reads made before the first write (e.g. the next version
+                number) can't be invalidated by a concurrent writer
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        if mode == 'rw' and not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
         try:
             yield conn
             conn.commit()
         except Exception:
             conn.rollback()
             raise
-        finally:
+
+    def close(self):
+        """Close the calling thread's connection (reopened on next use)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
             conn.close()
+            self._local.conn = None
 
     def init_database(self):
         """Initialize database schema"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
+            # WAL lets readers run alongside a writer (persists in the file)
+            cursor.execute("PRAGMA journal_mode = WAL")
+
             # Crawled pages with versioning
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS crawled_pages (
@@ -47,6 +212,7 @@ class Database:
                     country TEXT NOT NULL,
                     title TEXT,
                     content TEXT,
+                    content_len INTEGER,
                     metadata TEXT,
                     crawled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     version INTEGER DEFAULT 1,
@@ -55,12 +221,29 @@ class Database:
                 )
             """)
 
+            # Databases created before content was stored compressed; rows
+            # without content_len fall back to length(content)
+            cursor.execute("PRAGMA table_info(crawled_pages)")
+            if 'content_len' not in {row['name'] for row in cursor.fetchall()}:
+                cursor.execute("ALTER TABLE crawled_pages ADD COLUMN content_len INTEGER")
+
             # Create index for faster queries
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_crawled_url
                 ON crawled_pages(url, is_latest)
             """)
 
+            # Partial indexes over latest rows only, in listing order, so
+            # "WHERE is_latest = 1 ORDER BY crawled_at DESC" needs no sort
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_crawled_latest_country
+                ON crawled_pages(country, crawled_at DESC) WHERE is_latest = 1
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_crawled_latest_recent
+                ON crawled_pages(crawled_at DESC) WHERE is_latest = 1
+            """)
+
             # Structured visas with versioning
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS visas (
@@ -89,6 +272,15 @@ class Database:
                 ON visas(country, is_latest)
             """)
 
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_visa_latest_country
+                ON visas(country, created_at DESC) WHERE is_latest = 1
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_visa_latest_recent
+                ON visas(created_at DESC) WHERE is_latest = 1
+            """)
+
             # General immigration content (guides, FAQs, processes) with versioning
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS general_content (
@@ -180,17 +372,31 @@ class Database:
                     visa_id INTEGER NOT NULL,
                     embedding BLOB NOT NULL,
                     model_name TEXT NOT NULL,
+                    dtype TEXT NOT NULL DEFAULT 'float32',
                     indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (visa_id) REFERENCES visas(id),
                     UNIQUE(visa_id, model_name)
                 )
             """)
 
+            # Databases created before embeddings recorded their dtype
+            cursor.execute("PRAGMA table_info(embeddings)")
+            if 'dtype' not in {row['name'] for row in cursor.fetchall()}:
+                cursor.execute("""
+                    ALTER TABLE embeddings
+                    ADD COLUMN dtype TEXT NOT NULL DEFAULT 'float32'
+                """)
+
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_embeddings_visa
                 ON embeddings(visa_id)
             """)
 
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_embeddings_model
+                ON embeddings(model_name, visa_id)
+            """)
+
             # Settings (centralized configuration)
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS settings (
@@ -203,6 +409,12 @@ class Database:
                 )
             """)
 
+            # Settings are looked up by key (primary key) or listed by category
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_settings_category
+                ON settings(category)
+            """)
+
             # Insert default settings if table is empty
             cursor.execute("SELECT COUNT(*) as count FROM settings")
             if cursor.fetchone()['count'] == 0:
@@ -227,14 +439,79 @@ class Database:
                     VALUES (?, ?, ?, ?, ?)
                 """, default_settings)
 
+            self._init_stats_cache(cursor)
+
+            # Refresh planner statistics where they are missing or stale
+            cursor.execute("PRAGMA optimize")
+
             conn.commit()
 
+    def _init_stats_cache(self, cursor: sqlite3.Cursor):
+        """
+        Create the stats_cache counters and the triggers that maintain them.
+
+        Triggers are created before the counters are seeded, so a write
+        racing with the first initialization is counted exactly once.
+
+        Args:
+            cursor: Cursor inside the init_database connection
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stats_cache (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+
+        for key, (table, latest_only) in self._STATS_COUNTERS.items():
+            bump = f"UPDATE stats_cache SET value = value {{}} WHERE key = '{key}'"
+            if latest_only:
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_stats_{table}_insert
+                    AFTER INSERT ON {table} WHEN NEW.is_latest IS 1
+                    BEGIN {bump.format('+ 1')}; END
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_stats_{table}_update
+                    AFTER UPDATE OF is_latest ON {table}
+                    WHEN (OLD.is_latest IS 1) != (NEW.is_latest IS 1)
+                    BEGIN {bump.format('+ (NEW.is_latest IS 1) - (OLD.is_latest IS 1)')}; END
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_stats_{table}_delete
+                    AFTER DELETE ON {table} WHEN OLD.is_latest IS 1
+                    BEGIN {bump.format('- 1')}; END
+                """)
+                where = " WHERE is_latest = 1"
+            else:
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_stats_{table}_insert
+                    AFTER INSERT ON {table}
+                    BEGIN {bump.format('+ 1')}; END
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_stats_{table}_delete
+                    AFTER DELETE ON {table}
+                    BEGIN {bump.format('- 1')}; END
+                """)
+                where = ""
+
+            # Seed once from the existing rows; triggers keep it current after
+            cursor.execute(f"""
+                INSERT OR IGNORE INTO stats_cache (key, value)
+                SELECT '{key}', COUNT(*) FROM {table}{where}
+            """)
+
     # ============ CRAWLED PAGES ============
 
     def save_crawled_page(self, url: str, country: str, title: str,
                          content: str, metadata: Dict) -> int:
         """Save crawled page with automatic versioning"""
-        with self.get_connection() as conn:
+        # Compress and serialize before taking the write lock
+        stored_content = encode_page_content(content)
+        stored_metadata = _dumps_json(metadata)
+
+        with self.get_connection('rw') as conn:
             cursor = conn.cursor()
 
             # Check if URL exists
@@ -258,12 +535,94 @@ class Database:
             # Insert new version
             cursor.execute("""
                 INSERT INTO crawled_pages
-                (url, country, title, content, metadata, version, is_latest)
-                VALUES (?, ?, ?, ?, ?, ?, 1)
-            """, (url, country, title, content, json.dumps(metadata), new_version))
+                (url, country, title, content, content_len, metadata, version, is_latest)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+            """, (
+                url, country, title,
+                stored_content, len(content or ''),
+                stored_metadata, new_version
+            ))
 
             return cursor.lastrowid
 
+    def save_crawled_pages_batch(self, pages: List[CrawledPage]) -> int:
+        """
+        Save many crawled pages in one transaction with automatic versioning.
+
+        Existing versions are looked up per chunk of URLs, then old rows
+        are marked not-latest and new rows inserted with executemany.
+
+        Args:
+            pages: CrawledPage objects to save
+
+        Returns:
+            Number of pages saved
+        """
+        if not pages:
+            return 0
+
+        # Compress and serialize before taking the write lock, so other
+        # writers (parallel country crawls) only wait for the SQL
+        encoded = [
+            (encode_page_content(page.content), len(page.content or ''), _dumps_json(page.metadata))
+            for page in pages
+        ]
+
+        with self.get_connection('rw') as conn:
+            cursor = conn.cursor()
+
+            for start in range(0, len(pages), self.BATCH_CHUNK_SIZE):
+                chunk = pages[start:start + self.BATCH_CHUNK_SIZE]
+                urls = list({page.url for page in chunk})
+                placeholders = ','.join('?' * len(urls))
+
+                # Current version per URL
+                cursor.execute(f"""
+                    SELECT url, MAX(version) as max_version
+                    FROM crawled_pages
+                    WHERE url IN ({placeholders})
+                    GROUP BY url
+                """, urls)
+                versions = {row['url']: row['max_version'] for row in cursor.fetchall()}
+
+                # Mark old versions as not latest
+                if versions:
+                    cursor.executemany("""
+                        UPDATE crawled_pages
+                        SET is_latest = 0
+                        WHERE url = ?
+                    """, [(url,) for url in versions])
+
+                # Only the last occurrence of a URL in the batch stays latest
+                last_index = {page.url: i for i, page in enumerate(chunk)}
+                rows = []
+                for i, page in enumerate(chunk):
+                    version = versions.get(page.url, 0) + 1
+                    versions[page.url] = version
+                    stored_content, content_len, stored_metadata = encoded[start + i]
+                    rows.append((
+                        page.url, page.country, page.title,
+                        stored_content, content_len,
+                        stored_metadata, version,
+                        1 if last_index[page.url] == i else 0
+                    ))
+
+                # Insert new versions
+                _insert_many(cursor, """
+                    INSERT INTO crawled_pages
+                    (url, country, title, content, content_len, metadata, version, is_latest)
+                    VALUES
+                """, "(?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+            return len(pages)
+
+    @staticmethod
+    def _page_dict(row: sqlite3.Row) -> Dict:
+        """Convert a crawled_pages row to a dict with its content decompressed"""
+        page = dict(row)
+        page['content'] = decode_page_content(page['content'])
+        return page
+
     def get_latest_pages(self, country: Optional[str] = None) -> List[Dict]:
         """Get latest version of all crawled pages"""
         with self.get_connection() as conn:
@@ -282,7 +641,96 @@ class Database:
                     ORDER BY crawled_at DESC
                 """)
 
-            return [dict(row) for row in cursor.fetchall()]
+            return [self._page_dict(row) for row in cursor.fetchall()]
+
+    def get_page_rows(self, country: Optional[str] = None) -> List[PageRow]:
+        """
+        Get latest crawled pages as PageRow summaries (no content).
+
+        Content length comes from the stored content_len (length(content)
+        for older rows), so page bodies are never loaded into Python.
+
+        Args:
+            country: Optional country filter
+
+        Returns:
+            List of PageRow objects
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            if country:
+                cursor.execute("""
+                    SELECT id, url, country, title, crawled_at, version,
+                           COALESCE(content_len, length(content)) AS content_len
+                    FROM crawled_pages
+                    WHERE is_latest = 1 AND country = ?
+                    ORDER BY crawled_at DESC
+                """, (country,))
+            else:
+                cursor.execute("""
+                    SELECT id, url, country, title, crawled_at, version,
+                           COALESCE(content_len, length(content)) AS content_len
+                    FROM crawled_pages
+                    WHERE is_latest = 1
+                    ORDER BY crawled_at DESC
+                """)
+
+            return [PageRow.from_db_row(row) for row in cursor.fetchall()]
+
+    def get_page_content(self, page_id: int) -> str:
+        """Get the content of a single crawled page version"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_PAGE_CONTENT, (page_id,))
+            row = cursor.fetchone()
+            return (decode_page_content(row['content']) or '') if row else ''
+
+    def url_exists(self, url: str) -> bool:
+        """Check if a URL has been crawled (uses idx_crawled_url)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_URL_EXISTS, (url,))
+            return cursor.fetchone() is not None
+
+    def get_crawled_urls(self, country: Optional[str] = None) -> Set[str]:
+        """
+        Get the set of crawled URLs, for bulk de-duplication.
+
+        Args:
+            country: Optional country filter
+
+        Returns:
+            Set of URLs
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            if country:
+                cursor.execute("""
+                    SELECT url FROM crawled_pages
+                    WHERE is_latest = 1 AND country = ?
+                """, (country,))
+            else:
+                cursor.execute("SELECT url FROM crawled_pages WHERE is_latest = 1")
+
+            return {row[0] for row in cursor.fetchall()}
+
+    def count_pages_by_country(self) -> Dict[str, int]:
+        """
+        Count latest crawled pages per country, aggregated in SQL.
+
+        Returns:
+            Dict of {country: page_count}
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT country, COUNT(*) FROM crawled_pages
+                WHERE is_latest = 1
+                GROUP BY country
+            """)
+            return {row[0]: row[1] for row in cursor.fetchall()}
 
     def get_page_history(self, url: str) -> List[Dict]:
         """Get all versions of a specific URL"""
@@ -294,7 +742,7 @@ class Database:
                 ORDER BY version DESC
             """, (url,))
 
-            return [dict(row) for row in cursor.fetchall()]
+            return [self._page_dict(row) for row in cursor.fetchall()]
 
     # ============ VISAS ============
 
@@ -303,80 +751,157 @@ class Database:
                   documents_required: List = None, timeline_stages: Dict = None,
                   cost_breakdown: Dict = None, source_urls: List = None) -> int:
         """Save visa with automatic versioning"""
-        with self.get_connection() as conn:
+        with self.get_connection('rw') as conn:
             cursor = conn.cursor()
 
-            # Check if visa exists
+            # Retire the current latest version (no-op for a new visa)
             cursor.execute("""
-                SELECT MAX(version) as max_version
-                FROM visas
-                WHERE visa_type = ? AND country = ?
+                UPDATE visas
+                SET is_latest = 0, valid_to = CURRENT_TIMESTAMP
+                WHERE visa_type = ? AND country = ? AND is_latest = 1
             """, (visa_type, country))
 
-            result = cursor.fetchone()
-            new_version = (result['max_version'] or 0) + 1
-
-            # Mark old versions as not latest
-            if new_version > 1:
-                cursor.execute("""
-                    UPDATE visas
-                    SET is_latest = 0, valid_to = CURRENT_TIMESTAMP
-                    WHERE visa_type = ? AND country = ?
-                """, (visa_type, country))
-
-            # Insert new version
+            # Insert new version, numbering it in the same statement
             cursor.execute("""
                 INSERT INTO visas
                 (visa_type, country, category, requirements, fees, processing_time,
                  documents_required, timeline_stages, cost_breakdown, source_urls,
                  version, is_latest)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+                SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                       COALESCE(MAX(version), 0) + 1, 1
+                FROM visas
+                WHERE visa_type = ? AND country = ?
             """, (
                 visa_type, country, category,
-                json.dumps(requirements),
-                json.dumps(fees),
+                _dumps_json(requirements),
+                _dumps_json(fees),
                 processing_time,
-                json.dumps(documents_required or []),
-                json.dumps(timeline_stages or {}),
-                json.dumps(cost_breakdown or {}),
-                json.dumps(source_urls or []),
-                new_version
+                _dumps_json(documents_required or []),
+                _dumps_json(timeline_stages or {}),
+                _dumps_json(cost_breakdown or {}),
+                _dumps_json(source_urls or []),
+                visa_type, country
             ))
 
             return cursor.lastrowid
 
+    def save_visas_batch(self, visas: List[Dict]) -> int:
+        """
+        Save many visas in one transaction with automatic versioning.
+
+        Existing versions are looked up per chunk of (visa_type, country)
+        keys, then old rows are closed and new rows inserted with executemany.
+
+        Args:
+            visas: Dicts of save_visa keyword arguments
+
+        Returns:
+            Number of visas saved
+        """
+        if not visas:
+            return 0
+
+        # Two IN lists per chunk, so half the usual chunk size
+        chunk_size = self.BATCH_CHUNK_SIZE // 2
+
+        with self.get_connection('rw') as conn:
+            cursor = conn.cursor()
+
+            # One SQLite timestamp for every version this batch closes
+            now = cursor.execute("SELECT CURRENT_TIMESTAMP").fetchone()[0]
+
+            for start in range(0, len(visas), chunk_size):
+                chunk = visas[start:start + chunk_size]
+                keys = [(visa['visa_type'], visa['country']) for visa in chunk]
+                visa_types = list({key[0] for key in keys})
+                countries = list({key[1] for key in keys})
+
+                # Current version per (visa_type, country)
+                cursor.execute(f"""
+                    SELECT visa_type, country, MAX(version) as max_version
+                    FROM visas
+                    WHERE visa_type IN ({','.join('?' * len(visa_types))})
+                      AND country IN ({','.join('?' * len(countries))})
+                    GROUP BY visa_type, country
+                """, visa_types + countries)
+                wanted = set(keys)
+                versions = {}
+                for row in cursor.fetchall():
+                    key = (row['visa_type'], row['country'])
+                    if key in wanted:
+                        versions[key] = row['max_version']
+
+                # Retire the current latest versions (older ones keep their valid_to)
+                if versions:
+                    cursor.executemany("""
+                        UPDATE visas
+                        SET is_latest = 0, valid_to = ?
+                        WHERE visa_type = ? AND country = ? AND is_latest = 1
+                    """, [(now,) + key for key in versions])
+
+                # Only the last occurrence of a visa in the batch stays latest
+                last_index = {key: i for i, key in enumerate(keys)}
+                rows = []
+                for i, (visa, key) in enumerate(zip(chunk, keys)):
+                    version = versions.get(key, 0) + 1
+                    versions[key] = version
+                    latest = last_index[key] == i
+                    rows.append((
+                        visa['visa_type'], visa['country'], visa.get('category'),
+                        _dumps_json(visa.get('requirements') or {}),
+                        _dumps_json(visa.get('fees') or {}),
+                        visa.get('processing_time'),
+                        _dumps_json(visa.get('documents_required') or []),
+                        _dumps_json(visa.get('timeline_stages') or {}),
+                        _dumps_json(visa.get('cost_breakdown') or {}),
+                        _dumps_json(visa.get('source_urls') or []),
+                        None if latest else now,
+                        version,
+                        1 if latest else 0
+                    ))
+
+                # Insert new versions
+                _insert_many(cursor, """
+                    INSERT INTO visas
+                    (visa_type, country, category, requirements, fees, processing_time,
+                     documents_required, timeline_stages, cost_breakdown, source_urls,
+                     valid_to, version, is_latest)
+                    VALUES
+                """, "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+            return len(visas)
+
     def get_latest_visas(self, country: Optional[str] = None) -> List[Dict]:
         """Get latest version of all visas"""
+        return list(self.iter_latest_visas(country=country))
+
+    def iter_latest_visas(self, country: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Stream latest visas as dicts with JSON fields parsed, one row at a time.
+
+        Use instead of get_latest_visas() for single-pass or early-exit
+        consumers; rows are decoded only as they are consumed.
+
+        Args:
+            country: Optional country filter
+
+        Yields:
+            Visa dictionaries
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
             if country:
-                cursor.execute("""
-                    SELECT * FROM visas
-                    WHERE is_latest = 1 AND country = ?
-                    ORDER BY created_at DESC
-                """, (country,))
+                cursor.execute(_SQL_LATEST_VISAS_BY_COUNTRY, (country,))
             else:
-                cursor.execute("""
-                    SELECT * FROM visas
-                    WHERE is_latest = 1
-                    ORDER BY created_at DESC
-                """)
+                cursor.execute(_SQL_LATEST_VISAS)
 
-            rows = cursor.fetchall()
-            visas = []
-            for row in rows:
+            for row in cursor:
                 visa = dict(row)
                 # Parse JSON fields
-                visa['requirements'] = json.loads(visa['requirements'])
-                visa['fees'] = json.loads(visa['fees'])
-                visa['documents_required'] = json.loads(visa['documents_required'])
-                visa['timeline_stages'] = json.loads(visa['timeline_stages'])
-                visa['cost_breakdown'] = json.loads(visa['cost_breakdown'])
-                visa['source_urls'] = json.loads(visa['source_urls'])
-                visas.append(visa)
-
-            return visas
+                for column in self._VISA_JSON_COLUMNS:
+                    visa[column] = _loads_json(visa[column])
+                yield visa
 
     def get_visas(self, country: Optional[str] = None) -> List[Visa]:
         """
@@ -395,21 +920,76 @@ class Database:
             cursor = conn.cursor()
 
             if country:
-                cursor.execute("""
-                    SELECT * FROM visas
-                    WHERE is_latest = 1 AND country = ?
-                    ORDER BY created_at DESC
-                """, (country,))
+                cursor.execute(_SQL_LATEST_VISAS_BY_COUNTRY, (country,))
             else:
-                cursor.execute("""
-                    SELECT * FROM visas
-                    WHERE is_latest = 1
-                    ORDER BY created_at DESC
-                """)
+                cursor.execute(_SQL_LATEST_VISAS)
 
             rows = [dict(row) for row in cursor.fetchall()]
             return load_visas_from_rows(rows)
 
+    def iter_visas(self, country: Optional[str] = None) -> Iterator[Visa]:
+        """
+        Stream latest visas as Visa objects, one row at a time.
+
+        Use instead of get_visas() when the caller only needs a single
+        pass; rows are never all held in memory at once.
+
+        Args:
+            country: Optional country filter
+
+        Yields:
+            Visa objects
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            if country:
+                cursor.execute(_SQL_LATEST_VISAS_BY_COUNTRY, (country,))
+            else:
+                cursor.execute(_SQL_LATEST_VISAS)
+
+            for row in cursor:
+                yield Visa.from_db_row(dict(row))
+
+    def count_visas(self, country: Optional[str] = None) -> int:
+        """
+        Count latest visas in SQL (uses the country/is_latest index).
+
+        Args:
+            country: Optional country filter
+
+        Returns:
+            Number of latest visas
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if country:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM visas WHERE is_latest = 1 AND country = ?",
+                    (country,)
+                )
+            else:
+                cursor.execute("SELECT COUNT(*) FROM visas WHERE is_latest = 1")
+            return cursor.fetchone()[0]
+
+    def get_visa_data_version(self) -> Tuple[int, int]:
+        """
+        Cheap fingerprint of the latest visas, for cache invalidation.
+
+        Changes whenever a visa is added, re-versioned or deleted.
+
+        Returns:
+            (latest visa count, highest latest visa id)
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COUNT(*), COALESCE(MAX(id), 0) FROM visas
+                WHERE is_latest = 1
+            """)
+            row = cursor.fetchone()
+            return (row[0], row[1])
+
     # ============ GENERAL CONTENT ============
 
     def save_general_content(
@@ -441,7 +1021,7 @@ class Database:
         Returns:
             Content ID
         """
-        with self.get_connection() as conn:
+        with self.get_connection('rw') as conn:
             cursor = conn.cursor()
 
             # Check for existing versions
@@ -473,11 +1053,11 @@ class Database:
                 title,
                 content_type,
                 summary,
-                json.dumps(key_points),
+                _dumps_json(key_points),
                 content,
-                json.dumps(application_links),
+                _dumps_json(application_links),
                 source_url,
-                json.dumps(metadata),
+                _dumps_json(metadata),
                 new_version
             ))
 
@@ -551,6 +1131,35 @@ class Database:
             rows = [dict(row) for row in cursor.fetchall()]
             return load_pages_from_rows(rows)
 
+    def iter_pages(self, country: Optional[str] = None) -> Iterator[CrawledPage]:
+        """
+        Stream latest crawled pages as CrawledPage objects, one row at a time.
+
+        Args:
+            country: Optional country filter
+
+        Yields:
+            CrawledPage objects
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            if country:
+                cursor.execute("""
+                    SELECT * FROM crawled_pages
+                    WHERE is_latest = 1 AND country = ?
+                    ORDER BY crawled_at DESC
+                """, (country,))
+            else:
+                cursor.execute("""
+                    SELECT * FROM crawled_pages
+                    WHERE is_latest = 1
+                    ORDER BY crawled_at DESC
+                """)
+
+            for row in cursor:
+                yield CrawledPage.from_db_row(dict(row))
+
     def get_unclassified_pages(self, country: Optional[str] = None) -> List[CrawledPage]:
         """
         Get crawled pages that haven't been classified yet.
@@ -567,43 +1176,51 @@ class Database:
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            # Query to find pages without corresponding visas
+            # Pages without corresponding visas. The uncorrelated NOT IN
+            # subquery is built once into a lookup set; a correlated
+            # NOT EXISTS re-ran json_extract over every visa per page.
             if country:
-                cursor.execute("""
+                cursor.execute(f"""
                     SELECT cp.* FROM crawled_pages cp
                     WHERE cp.is_latest = 1
                       AND cp.country = ?
-                      AND NOT EXISTS (
-                        SELECT 1 FROM visas v
-                        WHERE v.is_latest = 1
-                          AND json_extract(v.source_urls, '$[0]') = cp.url
-                      )
+                      AND cp.url NOT IN ({self._CLASSIFIED_URLS_SQL})
                     ORDER BY cp.crawled_at DESC
                 """, (country,))
             else:
-                cursor.execute("""
+                cursor.execute(f"""
                     SELECT cp.* FROM crawled_pages cp
                     WHERE cp.is_latest = 1
-                      AND NOT EXISTS (
-                        SELECT 1 FROM visas v
-                        WHERE v.is_latest = 1
-                          AND json_extract(v.source_urls, '$[0]') = cp.url
-                      )
+                      AND cp.url NOT IN ({self._CLASSIFIED_URLS_SQL})
                     ORDER BY cp.crawled_at DESC
                 """)
 
             rows = [dict(row) for row in cursor.fetchall()]
             return load_pages_from_rows(rows)
 
+    def get_classified_urls(self) -> Set[str]:
+        """
+        Get every source URL referenced by a latest visa.
+
+        The JSON source_urls arrays are expanded by SQLite (json_each),
+        so callers get an O(1) membership set without loading visas.
+
+        Returns:
+            Set of classified page URLs
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT DISTINCT j.value FROM visas v, json_each(v.source_urls) j
+                WHERE v.is_latest = 1 AND json_valid(v.source_urls)
+            """)
+            return {row[0] for row in cursor.fetchall()}
+
     def get_visa_history(self, visa_type: str, country: str) -> List[Dict]:
         """Get all versions of a specific visa"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM visas
-                WHERE visa_type = ? AND country = ?
-                ORDER BY version DESC
-            """, (visa_type, country))
+            cursor.execute(_SQL_VISA_HISTORY, (visa_type, country))
 
             return [dict(row) for row in cursor.fetchall()]
 
@@ -612,12 +1229,12 @@ class Database:
     def save_client(self, name: str, email: str, nationality: str,
                    profile: Dict) -> int:
         """Save client profile"""
-        with self.get_connection() as conn:
+        with self.get_connection('rw') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO clients (name, email, nationality, profile)
                 VALUES (?, ?, ?, ?)
-            """, (name, email, nationality, json.dumps(profile)))
+            """, (name, email, nationality, _dumps_json(profile)))
 
             return cursor.lastrowid
 
@@ -625,12 +1242,12 @@ class Database:
         """Get client by ID"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM clients WHERE id = ?", (client_id,))
+            cursor.execute(_SQL_CLIENT, (client_id,))
             row = cursor.fetchone()
 
             if row:
                 client = dict(row)
-                client['profile'] = json.loads(client['profile'])
+                client['profile'] = _loads_json(client['profile'])
                 return client
             return None
 
@@ -641,7 +1258,7 @@ class Database:
                               requirements_snapshot: Dict, score: float,
                               eligible: bool, gaps: List, strengths: List) -> int:
         """Save eligibility check result (audit trail)"""
-        with self.get_connection() as conn:
+        with self.get_connection('rw') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO eligibility_checks
@@ -650,11 +1267,11 @@ class Database:
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 client_id, visa_id, visa_version,
-                json.dumps(profile_snapshot),
-                json.dumps(requirements_snapshot),
+                _dumps_json(profile_snapshot),
+                _dumps_json(requirements_snapshot),
                 score, eligible,
-                json.dumps(gaps),
-                json.dumps(strengths)
+                _dumps_json(gaps),
+                _dumps_json(strengths)
             ))
 
             return cursor.lastrowid
@@ -663,21 +1280,27 @@ class Database:
         """Get all eligibility checks for a client"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT ec.*, v.visa_type, v.country
-                FROM eligibility_checks ec
-                JOIN visas v ON ec.visa_id = v.id
-                WHERE ec.client_id = ?
-                ORDER BY ec.check_date DESC
-            """, (client_id,))
+            cursor.execute(_SQL_CLIENT_CHECKS, (client_id,))
 
             return [dict(row) for row in cursor.fetchall()]
 
     # ============ EMBEDDINGS ============
 
-    def save_embedding(self, visa_id: int, embedding: bytes, model_name: str = "all-MiniLM-L6-v2") -> int:
-        """Save embedding for a visa"""
-        with self.get_connection() as conn:
+    def save_embedding(self, visa_id: int, embedding, model_name: str = "all-MiniLM-L6-v2") -> int:
+        """
+        Save embedding for a visa
+
+        Args:
+            visa_id: Visa ID
+            embedding: numpy vector (stored as float16) or float32 bytes
+            model_name: Embedding model name
+
+        Returns:
+            Embedding row ID
+        """
+        blob, dtype = _encode_embedding(embedding)
+
+        with self.get_connection('rw') as conn:
             cursor = conn.cursor()
 
             # Delete old embedding for this visa+model if exists
@@ -688,14 +1311,51 @@ class Database:
 
             # Insert new embedding
             cursor.execute("""
-                INSERT INTO embeddings (visa_id, embedding, model_name)
-                VALUES (?, ?, ?)
-            """, (visa_id, embedding, model_name))
+                INSERT INTO embeddings (visa_id, embedding, model_name, dtype)
+                VALUES (?, ?, ?, ?)
+            """, (visa_id, blob, model_name, dtype))
 
             return cursor.lastrowid
 
+    def save_embeddings_batch(self, embeddings: List[Tuple[int, Any]],
+                              model_name: str = "all-MiniLM-L6-v2") -> int:
+        """
+        Save embeddings for many visas in one transaction.
+
+        Args:
+            embeddings: (visa_id, numpy vector or float32 bytes) pairs
+            model_name: Embedding model name
+
+        Returns:
+            Number of embeddings saved
+        """
+        if not embeddings:
+            return 0
+
+        rows = []
+        for visa_id, embedding in embeddings:
+            blob, dtype = _encode_embedding(embedding)
+            rows.append((visa_id, blob, model_name, dtype))
+
+        with self.get_connection('rw') as conn:
+            cursor = conn.cursor()
+
+            # Delete old embeddings for these visas+model
+            cursor.executemany("""
+                DELETE FROM embeddings
+                WHERE visa_id = ? AND model_name = ?
+            """, [(visa_id, model_name) for visa_id, _ in embeddings])
+
+            # Insert new embeddings
+            _insert_many(cursor, """
+                INSERT INTO embeddings (visa_id, embedding, model_name, dtype)
+                VALUES
+            """, "(?, ?, ?, ?)", rows)
+
+            return len(embeddings)
+
     def get_embeddings(self, model_name: str = "all-MiniLM-L6-v2") -> List[Dict]:
-        """Get all embeddings for a specific model"""
+        """Get all embeddings for a specific model (raw blobs with their dtype)"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -710,6 +1370,7 @@ class Database:
                 results.append({
                     'visa_id': row['visa_id'],
                     'embedding': row['embedding'],
+                    'dtype': row['dtype'],
                     'visa_type': row['visa_type'],
                     'country': row['country'],
                     'indexed_at': row['indexed_at']
@@ -717,57 +1378,69 @@ class Database:
 
             return results
 
-    def get_embedding(self, visa_id: int, model_name: str = "all-MiniLM-L6-v2") -> Optional[bytes]:
-        """Get embedding for a specific visa"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT embedding FROM embeddings
-                WHERE visa_id = ? AND model_name = ?
-            """, (visa_id, model_name))
+    def get_embedding_matrix(self, model_name: str = "all-MiniLM-L6-v2") -> Tuple[List[Dict], np.ndarray]:
+        """
+        Get all embeddings for a model as one unit-normalized matrix.
 
-            row = cursor.fetchone()
-            return row['embedding'] if row else None
+        Cosine similarity against every visa is then a single
+        matrix-vector product: matrix @ (query / |query|).
 
-    # ============ STATISTICS ============
+        Args:
+            model_name: Embedding model name
 
-    def get_stats(self) -> Dict:
-        """Get database statistics"""
+        Returns:
+            (visa info dicts without the embedding, float32 matrix with one row per visa)
+        """
+        embeddings = self.get_embeddings(model_name)
+        if not embeddings:
+            return [], np.empty((0, 0), dtype=np.float32)
+
+        dtypes = {item['dtype'] for item in embeddings}
+        if len(dtypes) == 1:
+            matrix = np.frombuffer(
+                b''.join(item.pop('embedding') for item in embeddings), dtype=dtypes.pop()
+            ).reshape(len(embeddings), -1)
+        else:
+            matrix = np.vstack([
+                np.frombuffer(item.pop('embedding'), dtype=item['dtype']) for item in embeddings
+            ])
+        matrix = matrix.astype(np.float32)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings, matrix / norms
+
+    def get_embedding(self, visa_id: int, model_name: str = "all-MiniLM-L6-v2") -> Optional[np.ndarray]:
+        """Get embedding for a specific visa, decoded with its stored dtype"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute(_SQL_EMBEDDING, (visa_id, model_name))
 
-            stats = {}
-
-            # Pages crawled
-            cursor.execute("SELECT COUNT(*) as count FROM crawled_pages WHERE is_latest = 1")
-            stats['pages_crawled'] = cursor.fetchone()['count']
+            row = cursor.fetchone()
+            return np.frombuffer(row['embedding'], dtype=row['dtype']) if row else None
 
-            # Visas
-            cursor.execute("SELECT COUNT(*) as count FROM visas WHERE is_latest = 1")
-            stats['visas_total'] = cursor.fetchone()['count']
+    # ============ STATISTICS ============
 
-            # General content
-            cursor.execute("SELECT COUNT(*) as count FROM general_content WHERE is_latest = 1")
-            stats['general_content'] = cursor.fetchone()['count']
+    def get_stats(self) -> Dict:
+        """
+        Get database statistics.
 
-            # Countries - count from crawled_pages if no visas, otherwise from visas
-            if stats['visas_total'] > 0:
-                cursor.execute("SELECT COUNT(DISTINCT country) as count FROM visas WHERE is_latest = 1")
-            else:
-                cursor.execute("SELECT COUNT(DISTINCT country) as count FROM crawled_pages WHERE is_latest = 1")
-            stats['countries'] = cursor.fetchone()['count']
+        Row counts come from stats_cache (maintained by triggers), so only
+        the distinct country count touches the data tables.
 
-            # Clients
-            cursor.execute("SELECT COUNT(*) as count FROM clients")
-            stats['clients'] = cursor.fetchone()['count']
+        Returns:
+            Dict of counts keyed by statistic name
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
 
-            # Checks
-            cursor.execute("SELECT COUNT(*) as count FROM eligibility_checks")
-            stats['checks_performed'] = cursor.fetchone()['count']
+            cursor.execute(_SQL_STATS_COUNTERS)
+            counts = dict(cursor.fetchall())
+            stats = {key: counts.get(key, 0) for key in self._STATS_COUNTERS}
 
-            # Embeddings
-            cursor.execute("SELECT COUNT(*) as count FROM embeddings")
-            stats['embeddings'] = cursor.fetchone()['count']
+            # Countries - from visas, or from crawled_pages while there are none
+            cursor.execute(_SQL_STATS_COUNTRIES)
+            stats['countries'] = cursor.fetchone()[0]
 
             return stats
 
@@ -783,7 +1456,7 @@ class Database:
         Returns:
             Number of pages deleted
         """
-        with self.get_connection() as conn:
+        with self.get_connection('rw') as conn:
             cursor = conn.cursor()
 
             if country:
@@ -808,7 +1481,7 @@ class Database:
         Returns:
             Number of visas deleted
         """
-        with self.get_connection() as conn:
+        with self.get_connection('rw') as conn:
             cursor = conn.cursor()
 
             if country:
@@ -833,7 +1506,7 @@ class Database:
         Returns:
             Number of content items deleted
         """
-        with self.get_connection() as conn:
+        with self.get_connection('rw') as conn:
             cursor = conn.cursor()
 
             if country:
@@ -855,7 +1528,7 @@ class Database:
         Returns:
             Number of embeddings deleted
         """
-        with self.get_connection() as conn:
+        with self.get_connection('rw') as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) as count FROM embeddings")
             count = cursor.fetchone()['count']
@@ -870,7 +1543,7 @@ class Database:
         Returns:
             Number of clients deleted
         """
-        with self.get_connection() as conn:
+        with self.get_connection('rw') as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) as count FROM clients")
             count = cursor.fetchone()['count']
@@ -885,7 +1558,7 @@ class Database:
         Returns:
             Number of records deleted
         """
-        with self.get_connection() as conn:
+        with self.get_connection('rw') as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) as count FROM eligibility_checks")
             count = cursor.fetchone()['count']
@@ -15,13 +15,51 @@ Usage:
     print(visa.requirements.age_range)
 """
 
-from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Optional
+from dataclasses import dataclass, field, fields, asdict
+from typing import List, Dict, Optional, Union
+import copy
 import json
+import zlib
+
+try:
+    from orjson import loads as _loads_json
+except ImportError:
+    _loads_json = json.loads
+
+# Page bodies at least this long are stored zlib-compressed
+_COMPRESS_MIN_CHARS = 1024
+
+
+def _add_slots(cls):
+    """
+    Rebuild a dataclass with __slots__ (dataclass(slots=True) needs Python 3.10).
+
+    Instances then have no per-object __dict__, which matters for models
+    loaded by the thousand. Field defaults live in the generated __init__.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    namespace['__slots__'] = names
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def _parse_json(value, default):
+    """Parse a JSON column, or return it as-is if already parsed"""
+    if isinstance(value, str):
+        try:
+            return _loads_json(value) if value else default
+        except json.JSONDecodeError:
+            return default
+    return value if value else default
 
 
 # ============ VISA DATA ============
 
+@_add_slots
 @dataclass
 class Visa:
     """
@@ -61,25 +99,16 @@ class Visa:
         Returns:
             Visa object with all fields populated
         """
-        def parse_json(value, default):
-            """Parse JSON string or return as-is if already parsed"""
-            if isinstance(value, str):
-                try:
-                    return json.loads(value) if value else default
-                except json.JSONDecodeError:
-                    return default
-            return value if value else default
-
         return cls(
             id=row.get('id'),
             visa_type=row.get('visa_type', ''),
             country=row.get('country', ''),
             category=row.get('category', ''),
-            requirements=parse_json(row.get('requirements'), {}),
-            fees=parse_json(row.get('fees'), {}),
+            requirements=_parse_json(row.get('requirements'), {}),
+            fees=_parse_json(row.get('fees'), {}),
             processing_time=row.get('processing_time', ''),
-            documents_required=parse_json(row.get('documents_required'), []),
-            source_urls=parse_json(row.get('source_urls'), []),
+            documents_required=_parse_json(row.get('documents_required'), []),
+            source_urls=_parse_json(row.get('source_urls'), []),
             language=row.get('language', ''),
             version=row.get('version', 1),
             created_at=row.get('created_at')
@@ -210,26 +239,17 @@ class GeneralContent:
         Returns:
             GeneralContent object with all fields populated
         """
-        def parse_json(value, default):
-            """Parse JSON string or return as-is if already parsed"""
-            if isinstance(value, str):
-                try:
-                    return json.loads(value) if value else default
-                except json.JSONDecodeError:
-                    return default
-            return value if value else default
-
         return cls(
             id=row.get('id'),
             country=row.get('country', ''),
             title=row.get('title', ''),
             content_type=row.get('content_type', ''),
             summary=row.get('summary', ''),
-            key_points=parse_json(row.get('key_points'), []),
+            key_points=_parse_json(row.get('key_points'), []),
             content=row.get('content', ''),
-            application_links=parse_json(row.get('application_links'), []),
+            application_links=_parse_json(row.get('application_links'), []),
             source_url=row.get('source_url', ''),
-            metadata=parse_json(row.get('metadata'), {}),
+            metadata=_parse_json(row.get('metadata'), {}),
             version=row.get('version', 1),
             created_at=row.get('created_at')
         )
@@ -279,6 +299,7 @@ class GeneralContent:
 
 # ============ CRAWLED PAGE ============
 
+@_add_slots
 @dataclass
 class CrawledPage:
     """
@@ -303,7 +324,7 @@ class CrawledPage:
         metadata = row.get('metadata', {})
         if isinstance(metadata, str):
             try:
-                metadata = json.loads(metadata) if metadata else {}
+                metadata = _loads_json(metadata) if metadata else {}
             except json.JSONDecodeError:
                 metadata = {}
 
@@ -312,7 +333,7 @@ class CrawledPage:
             url=row.get('url', ''),
             country=row.get('country', ''),
             title=row.get('title', ''),
-            content=row.get('content', ''),
+            content=decode_page_content(row.get('content', '')),
             metadata=metadata,
             crawled_at=row.get('crawled_at'),
             version=row.get('version', 1)
@@ -334,6 +355,38 @@ class CrawledPage:
         return self.metadata.get('attachments', [])
 
 
+@dataclass(frozen=True)
+class PageRow:
+    """
+    Lightweight summary of a crawled page, without its content.
+
+    Used for listing thousands of pages in the UI. Slots keep each
+    row small; fetch the content separately when it is needed.
+    """
+    __slots__ = ('id', 'url', 'country', 'title', 'crawled_at', 'version', 'content_len')
+
+    id: int
+    url: str
+    country: str
+    title: str
+    crawled_at: str
+    version: int
+    content_len: int
+
+    @classmethod
+    def from_db_row(cls, row) -> 'PageRow':
+        """Create from database row (dict or sqlite3.Row)"""
+        return cls(
+            id=row['id'],
+            url=row['url'] or '',
+            country=row['country'] or '',
+            title=row['title'] or '',
+            crawled_at=row['crawled_at'] or '',
+            version=row['version'] or 1,
+            content_len=row['content_len'] or 0
+        )
+
+
 # ============ USER PROFILE ============
 
 @dataclass
@@ -403,6 +456,47 @@ class MatchResult:
         }
 
 
+@dataclass(frozen=True)
+class MatchRow:
+    """
+    Compact match record kept in the matcher's result cache.
+
+    Slots keep thousands of cached matches small; to_dict() builds the
+    plain dictionary handed to callers, with its own copies of the
+    mutable fields so callers can't alter the cached record.
+    """
+    __slots__ = ('visa_type', 'country', 'category', 'eligibility_score', 'match_level',
+                 'eligible', 'gaps', 'fees', 'processing_time', 'language', 'source_urls')
+
+    visa_type: str
+    country: str
+    category: str
+    eligibility_score: float
+    match_level: str
+    eligible: bool
+    gaps: List[str]
+    fees: Dict
+    processing_time: Optional[str]
+    language: Optional[str]
+    source_urls: List[str]
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for display and JSON serialization"""
+        return {
+            'visa_type': self.visa_type,
+            'country': self.country,
+            'category': self.category,
+            'eligibility_score': self.eligibility_score,
+            'match_level': self.match_level,
+            'eligible': self.eligible,
+            'gaps': list(self.gaps),
+            'fees': copy.deepcopy(self.fees),
+            'processing_time': self.processing_time,
+            'language': self.language,
+            'source_urls': list(self.source_urls)
+        }
+
+
 # ============ HELPER FUNCTIONS ============
 
 def load_visas_from_rows(rows: List[dict]) -> List[Visa]:
@@ -431,3 +525,36 @@ def load_pages_from_rows(rows: List[dict]) -> List[CrawledPage]:
         List of CrawledPage objects
     """
     return [CrawledPage.from_db_row(row) for row in rows]
+
+
+def encode_page_content(content: Optional[str]) -> Union[str, bytes, None]:
+    """
+    Prepare page content for storage.
+
+    Long bodies are zlib-compressed (stored as a BLOB); short ones are
+    kept as plain text, where compression would not pay for itself.
+
+    Args:
+        content: Page text
+
+    Returns:
+        Compressed bytes, or the content unchanged
+    """
+    if content and len(content) >= _COMPRESS_MIN_CHARS:
+        return zlib.compress(content.encode('utf-8'))
+    return content
+
+
+def decode_page_content(value: Union[str, bytes, None]) -> Optional[str]:
+    """
+    Restore page content read from the database.
+
+    Args:
+        value: Stored content (compressed bytes or plain text)
+
+    Returns:
+        Page text
+    """
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode('utf-8')
+    return value
@@ -5,11 +5,12 @@ YAML files are ONLY used as defaults on first run
 """
 
 import os
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
-import yaml
+from typing import Callable, Dict, Any, List, Optional
 import sqlite3
-from shared.config_manager import ConfigManager
+
+from shared.config_manager import ConfigManager, load_yaml_file
 
 
 class ServiceConfigLoader:
@@ -42,12 +43,18 @@ class ServiceConfigLoader:
 
     def _load_yaml_defaults(self):
         """Load all configuration defaults from YAML files into database"""
+        # One transaction for every default instead of a commit per setting
+        with self.config_mgr.batch():
+            self._write_yaml_defaults()
+
+        print("✅ Configuration defaults loaded into database")
 
+    def _write_yaml_defaults(self):
+        """Write global and service YAML defaults to the database"""
         # 1. Load global config.yaml
         global_config_path = Path('config.yaml')
         if global_config_path.exists():
-            with open(global_config_path, 'r') as f:
-                global_config = yaml.safe_load(f)
+            global_config = load_yaml_file(global_config_path)
 
             # Load countries
             if 'countries' in global_config:
@@ -70,8 +77,6 @@ class ServiceConfigLoader:
         self._load_service_yaml('matcher')
         self._load_service_yaml('assistant')
 
-        print("✅ Configuration defaults loaded into database")
-
     def _load_service_yaml(self, service_name: str):
         """Load service-specific YAML config into database"""
         config_path = Path(f'services/{service_name}/config.yaml')
@@ -79,8 +84,7 @@ class ServiceConfigLoader:
         if not config_path.exists():
             return
 
-        with open(config_path, 'r') as f:
-            service_config = yaml.safe_load(f)
+        service_config = load_yaml_file(config_path)
 
         # Store service config as JSON in database
         if service_config:
@@ -103,6 +107,8 @@ class ServiceConfigLoader:
                 'delay_between_requests': self.config_mgr.get('crawler.delay', 1.0),
                 'concurrent_requests': service_config.get('crawling', {}).get('concurrent_requests', 1),
                 'timeout': service_config.get('crawling', {}).get('timeout', 30),
+                'max_page_bytes': service_config.get('crawling', {}).get('max_page_bytes', 2097152),
+                'relevance_scan_bytes': service_config.get('crawling', {}).get('relevance_scan_bytes', 262144),
                 'robots_txt': service_config.get('crawling', {}).get('robots_txt', True),
                 'user_agent': service_config.get('crawling', {}).get('user_agent', 'Mozilla/5.0 (compatible; ImmigrationBot/1.0)')
             },
@@ -194,11 +200,37 @@ class ServiceConfigLoader:
 
 # Global instance
 _service_config = None
+_service_config_lock = threading.Lock()
+
+# Clear functions of services that memoize their config (see clear_config_caches)
+_config_cache_clearers: List[Callable[[], None]] = []
+
+
+def register_config_cache(clear: Callable[[], None]):
+    """
+    Register a function that drops a service's memoized config.
+
+    Services call this at import, so only caches that exist in the
+    process are cleared.
+
+    Args:
+        clear: Function that clears the cache
+    """
+    if clear not in _config_cache_clearers:
+        _config_cache_clearers.append(clear)
+
+
+def clear_config_caches():
+    """Make every service pick up saved settings on next use (call after settings change)"""
+    for clear in _config_cache_clearers:
+        clear()
 
 
 def get_service_config() -> ServiceConfigLoader:
-    """Get global service config loader instance"""
+    """Get global service config loader instance (created once, even if threads race)"""
     global _service_config
     if _service_config is None:
-        _service_config = ServiceConfigLoader()
+        with _service_config_lock:
+            if _service_config is None:
+                _service_config = ServiceConfigLoader()
     return _service_config
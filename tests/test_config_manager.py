@@ -49,6 +49,7 @@ class TestConfigManager:
 
     def cleanup(self):
         """Clean up test files"""
+        self.config.close()
         if os.path.exists(self.temp_dir):
             shutil.rmtree(self.temp_dir)
 
@@ -261,6 +262,75 @@ class TestConfigManager:
 
         print("✅ Priority system works (DB > YAML)")
 
+    def test_batch_writes(self):
+        """Test grouping writes into one transaction"""
+        print("\n📦 Testing batched writes...")
+
+        with self.config.batch():
+            self.config.set('batch.a', 1)
+            self.config.set('batch.b', 'two')
+
+        assert self.config.get('batch.a') == 1, "Batched int should be saved"
+        assert self.config.get('batch.b') == 'two', "Batched string should be saved"
+
+        # A failing batch rolls back every write in it
+        try:
+            with self.config.batch():
+                self.config.set('batch.c', 'lost')
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+
+        assert self.config.get('batch.c') is None, "Aborted batch should roll back"
+
+        # set_many keeps each value's type
+        assert self.config.set_many({'batch.d': 2.5, 'batch.e': True}), "set_many should succeed"
+        assert self.config.get('batch.d') == 2.5, "set_many float should round-trip"
+        assert self.config.get('batch.e') is True, "set_many bool should round-trip"
+
+        print("✅ Batched writes work")
+
+    def test_yaml_defaults_isolated(self):
+        """Test that YAML defaults handed out can't be mutated for other instances"""
+        print("\n🛡️  Testing YAML default isolation...")
+
+        # Fresh database with nothing stored, so values come from YAML
+        first = ConfigManager(db_path=os.path.join(self.temp_dir, 'yaml_a.db'))
+        second = ConfigManager(db_path=os.path.join(self.temp_dir, 'yaml_b.db'))
+        try:
+            countries = first.get_countries()
+            countries['zz'] = {'name': 'Nowhere'}
+
+            assert 'zz' not in first.get_countries(), "Mutation should not reach the cached YAML"
+            assert 'zz' not in second.get_countries(), "Mutation should not leak to other instances"
+        finally:
+            first.close()
+            second.close()
+
+        print("✅ YAML defaults are isolated")
+
+    def test_shared_database_instances(self):
+        """Test that writes through one instance reach another on the same database"""
+        print("\n🔗 Testing instances sharing a database...")
+
+        other = ConfigManager(db_path=self.test_db)
+        try:
+            # Warm the other instance's cache before writing
+            other.get_list_config('shared.keywords')
+            other.get('shared.value')
+
+            self.config.set_list_config('shared.keywords', ['EDITED'])
+            self.config.set('shared.value', 7)
+            self.config.set_countries({'xx': {'name': 'Shared'}})
+
+            assert other.get_list_config('shared.keywords') == ['EDITED'], "List change should reach other instance"
+            assert other.get('shared.value') == 7, "Setting should reach other instance"
+            assert 'xx' in other.get_countries(), "Countries should reach other instance"
+        finally:
+            other.close()
+
+        print("✅ Instances sharing a database stay in sync")
+
     def run_all_tests(self):
         """Run all tests"""
         print("\n" + "=" * 60)
@@ -277,6 +347,9 @@ class TestConfigManager:
             self.test_llm_config()
             self.test_reset_to_defaults()
             self.test_priority_system()
+            self.test_batch_writes()
+            self.test_yaml_defaults_isolated()
+            self.test_shared_database_instances()
 
             print("\n" + "=" * 60)
             print("🎉 ALL CONFIG MANAGER TESTS PASSED!")
@@ -13,8 +13,9 @@ from unittest.mock import Mock, patch
 sys.path.insert(0, os.path.abspath('.'))
 
 from services.crawler.engine import CrawlerEngine
+from services.crawler.browser_engine import BrowserCrawlerEngine
 from services.crawler.repository import CrawlerRepository
-from services.crawler.interface import CrawlerService
+from services.crawler.interface import CrawlerService, CrawlerController
 from shared.models import CrawledPage
 
 
@@ -35,6 +36,7 @@ class TestCrawlerService:
                 'max_depth': 2,
                 'max_pages_per_country': 10,
                 'delay_between_requests': 0.1,  # Fast for testing
+                'concurrent_requests': 1,
                 'timeout': 5,
                 'user_agent': 'TestBot/1.0'
             },
@@ -96,6 +98,53 @@ class TestCrawlerService:
         assert len(pages) == 1, "Should have only one page (updated)"
         assert pages[0].title == 'Updated Visa Page', "Title should be updated"
 
+        # Batch save: one new page plus a new version of an existing one
+        saved = repo.save_pages_batch([
+            CrawledPage(url='http://example.com/permit', country='TestCountry',
+                        title='Permit Page', content='Permit info', metadata={}),
+            CrawledPage(url='http://example.com/visa', country='TestCountry',
+                        title='Batched Visa Page', content='Batched', metadata={})
+        ])
+        assert saved == 2, "Should save both pages in one batch"
+
+        pages = {p.url: p for p in repo.get_pages_by_country('TestCountry')}
+        assert len(pages) == 2, "Should have one latest row per URL"
+        assert pages['http://example.com/visa'].title == 'Batched Visa Page', "Batch should add a new latest version"
+        assert pages['http://example.com/visa'].version == 3, "Batch should continue version numbering"
+
+        # Streaming matches the list API
+        streamed = [p.url for p in repo.iter_pages('TestCountry')]
+        assert sorted(streamed) == sorted(pages), "Should stream the same pages"
+
+        # Page counts per country
+        assert repo.count_pages_by_country()['TestCountry'] == 2, "Should count latest pages per country"
+
+        # URL lookups
+        assert repo.url_exists('http://example.com/permit'), "Should find crawled URL"
+        assert not repo.url_exists('http://example.com/missing'), "Should not find unknown URL"
+        assert repo.get_crawled_urls('TestCountry') == {
+            'http://example.com/visa', 'http://example.com/permit'
+        }, "Should list crawled URLs for country"
+
+        # Summary rows carry content length but not content
+        rows = {r.url: r for r in repo.db.get_page_rows(country='TestCountry')}
+        assert rows['http://example.com/permit'].content_len == len('Permit info'), "Should report content length"
+        assert not hasattr(rows['http://example.com/permit'], '__dict__'), "Rows should use slots"
+        assert repo.db.get_page_content(rows['http://example.com/permit'].id) == 'Permit info', "Should load content on demand"
+
+        # Classified URLs come from visa source_urls
+        repo.db.save_visa('Test Visa', 'TestCountry', 'work', {}, {}, '',
+                          source_urls=['http://example.com/visa'])
+        classified = repo.db.get_classified_urls()
+        assert classified == {'http://example.com/visa'}, "Should collect visa source URLs"
+
+        # Long page bodies are stored compressed and restored on read
+        long_content = 'Visa requirements and fees. ' * 100
+        page_id = repo.db.save_crawled_page('http://example.com/long', 'LongCountry', 'Long', long_content, {})
+        assert repo.db.get_page_content(page_id) == long_content, "Should restore compressed content"
+        assert repo.get_pages_by_country('LongCountry')[0].content == long_content, "Pages should load decompressed"
+        assert repo.db.get_page_rows(country='LongCountry')[0].content_len == len(long_content), "Should report uncompressed length"
+
         print("✅ Repository works")
 
     def test_engine_relevance_check(self):
@@ -113,6 +162,12 @@ class TestCrawlerService:
         irrelevant_text = "This is a page about sports and weather news"
         assert not engine._is_relevant(irrelevant_text), "Should reject irrelevant content"
 
+        # Keywords sharing a prefix are factored into one trie pattern
+        pattern = CrawlerEngine._trie_pattern(['permit', 'permanent', 'visa', 'visas'])
+        assert pattern == '(?:perm(?:anent|it)|visa(?:s)?)', f"Unexpected trie pattern: {pattern}"
+        assert engine._is_relevant("Apply for a PERMIT online"), "Should match case-insensitively"
+        assert not engine._is_relevant("perm"), "Should not match a bare shared prefix"
+
         print("✅ Relevance check works")
 
     def test_engine_url_exclusion(self):
@@ -179,7 +234,7 @@ class TestCrawlerService:
         repo = CrawlerRepository(db_path=self.test_db)
         engine = CrawlerEngine(self.test_config, repo)
 
-        from bs4 import BeautifulSoup
+        import lxml.html
 
         html = """
         <nav aria-label="breadcrumb">
@@ -189,8 +244,8 @@ class TestCrawlerService:
         </nav>
         """
 
-        soup = BeautifulSoup(html, 'lxml')
-        breadcrumbs = engine._extract_breadcrumbs(soup)
+        doc = lxml.html.document_fromstring(html)
+        breadcrumbs = engine._extract_breadcrumbs(doc)
 
         assert len(breadcrumbs) == 3, "Should extract all breadcrumbs"
         assert breadcrumbs[0] == 'Home', "First breadcrumb should be Home"
@@ -205,7 +260,7 @@ class TestCrawlerService:
         repo = CrawlerRepository(db_path=self.test_db)
         engine = CrawlerEngine(self.test_config, repo)
 
-        from bs4 import BeautifulSoup
+        import lxml.html
 
         html = """
         <html>
@@ -218,8 +273,8 @@ class TestCrawlerService:
         </html>
         """
 
-        soup = BeautifulSoup(html, 'lxml')
-        links = engine._extract_links(soup, 'http://example.com/visas')
+        doc = lxml.html.document_fromstring(html)
+        links, _ = engine._extract_anchors(doc, 'http://example.com/visas')
 
         # Should include same-domain links only
         assert len(links) >= 3, "Should extract same-domain links"
@@ -228,6 +283,38 @@ class TestCrawlerService:
 
         print("✅ Link extraction works")
 
+    def test_engine_link_canonicalization(self):
+        """Test links are canonicalized and deduplicated"""
+        print("\n🧭 Testing Link Canonicalization...")
+
+        repo = CrawlerRepository(db_path=self.test_db)
+        engine = CrawlerEngine(self.test_config, repo)
+
+        import lxml.html
+
+        html = """
+        <html>
+        <body>
+            <a href="/visa/work/">Work Visa</a>
+            <a href="/visa/work#eligibility">Work Visa Eligibility</a>
+            <a href="/visa/search?b=2&a=1">Search</a>
+            <a href="HTTP://EXAMPLE.com/visa/search?a=1&b=2">Search Again</a>
+            <a href="/visa/study">Study Visa</a>
+        </body>
+        </html>
+        """
+
+        engine.visited.add('http://example.com/visa/study')
+        doc = lxml.html.document_fromstring(html)
+        links, _ = engine._extract_anchors(doc, 'http://example.com/visas')
+
+        assert links == [
+            'http://example.com/visa/work',
+            'http://example.com/visa/search?a=1&b=2'
+        ], "Should collapse duplicate spellings and skip visited URLs"
+
+        print("✅ Link canonicalization works")
+
     def test_engine_attachment_extraction(self):
         """Test document attachment extraction"""
         print("\n📎 Testing Attachment Extraction...")
@@ -235,7 +322,7 @@ class TestCrawlerService:
         repo = CrawlerRepository(db_path=self.test_db)
         engine = CrawlerEngine(self.test_config, repo)
 
-        from bs4 import BeautifulSoup
+        import lxml.html
 
         html = """
         <html>
@@ -247,15 +334,86 @@ class TestCrawlerService:
         </html>
         """
 
-        soup = BeautifulSoup(html, 'lxml')
-        attachments = engine._extract_attachments(soup, 'http://example.com/')
+        doc = lxml.html.document_fromstring(html)
+        links, attachments = engine._extract_anchors(doc, 'http://example.com/')
 
         assert len(attachments) == 2, "Should find 2 attachments"
         assert attachments[0]['type'] == 'pdf', "First should be PDF"
         assert attachments[1]['type'] == 'doc', "Second should be DOC"
+        assert links == ['http://example.com/info/page'], "Attachments should not be queued as links"
 
         print("✅ Attachment extraction works")
 
+    def test_visited_bloom_filter(self):
+        """Test the scalable Bloom filter used for visited URLs"""
+        print("\n🌸 Testing Visited Bloom Filter...")
+
+        from services.crawler.bloom import ScalableBloomFilter
+
+        visited = ScalableBloomFilter(initial_capacity=100, error_rate=0.001)
+        urls = [f'http://example.com/page/{i}' for i in range(1000)]
+        for url in urls:
+            visited.add(url)
+
+        assert all(url in visited for url in urls), "Should never miss an added URL"
+        assert len(visited.filters) > 1, "Should grow past initial capacity"
+
+        false_positives = sum(
+            f'http://example.com/other/{i}' in visited for i in range(1000)
+        )
+        assert false_positives < 20, "False-positive rate should stay low"
+
+        visited.clear()
+        assert len(visited) == 0, "Clear should empty the filter"
+        assert urls[0] not in visited, "Cleared filter should not contain URLs"
+
+        print("✅ Visited Bloom filter works")
+
+    def test_engine_frontier_priority(self):
+        """Test frontier pops shallow, keyword-rich URLs first"""
+        print("\n📊 Testing Frontier Priority...")
+
+        import heapq
+
+        repo = CrawlerRepository(db_path=self.test_db)
+        engine = CrawlerEngine(self.test_config, repo)
+
+        engine._enqueue('http://example.com/deep/visa', 2)
+        engine._enqueue('http://example.com/sports', 1)
+        engine._enqueue('http://example.com/visa-immigration', 1)
+        engine._enqueue('http://example.com/weather', 1)
+
+        # Already-queued URLs are not pushed again
+        assert not engine._enqueue('http://example.com/sports', 1), "Should drop duplicate URL"
+        assert len(engine.to_visit) == 4, "Frontier should hold each URL once"
+
+        order = [heapq.heappop(engine.to_visit)[3] for _ in range(4)]
+        assert order == [
+            'http://example.com/visa-immigration',
+            'http://example.com/sports',
+            'http://example.com/weather',
+            'http://example.com/deep/visa'
+        ], "Should order by depth, keyword score, then insertion"
+
+        print("✅ Frontier priority works")
+
+    def test_engine_shared_session(self):
+        """Test engines reuse one HTTP session per user agent"""
+        print("\n🔌 Testing Shared HTTP Session...")
+
+        repo = CrawlerRepository(db_path=self.test_db)
+        engine1 = CrawlerEngine(self.test_config, repo)
+        engine2 = CrawlerEngine(self.test_config, repo)
+
+        assert engine1.session is engine2.session, "Engines should share a session"
+        assert engine1.session.headers['User-Agent'] == 'TestBot/1.0', "Should set user agent"
+
+        adapter = engine1.session.get_adapter('https://example.com')
+        assert adapter._pool_maxsize >= 32, "Should use an enlarged connection pool"
+        assert adapter.max_retries.total == 3, "Should retry transient errors"
+
+        print("✅ Shared HTTP session works")
+
     def test_engine_reset(self):
         """Test engine state reset"""
         print("\n🔄 Testing Engine Reset...")
@@ -266,7 +424,7 @@ class TestCrawlerService:
         # Add some state
         engine.visited.add('http://example.com/page1')
         engine.visited.add('http://example.com/page2')
-        engine.to_visit.append(('http://example.com/page3', 0))
+        engine._enqueue('http://example.com/page3', 0)
 
         assert len(engine.visited) == 2, "Should have visited URLs"
         assert len(engine.to_visit) == 1, "Should have URLs to visit"
@@ -276,11 +434,11 @@ class TestCrawlerService:
 
         assert len(engine.visited) == 0, "Visited should be cleared"
         assert len(engine.to_visit) == 0, "To visit should be cleared"
+        assert engine._enqueue('http://example.com/page3', 0), "Should allow re-queueing after reset"
 
         print("✅ Engine reset works")
 
-    @patch('services.crawler.engine.requests.Session')
-    def test_engine_crawl_with_mock(self, mock_session_class):
+    def test_engine_crawl_with_mock(self):
         """Test crawling with mocked HTTP requests"""
         print("\n🕷️ Testing Engine Crawl (Mocked)...")
 
@@ -288,7 +446,7 @@ class TestCrawlerService:
         mock_session = Mock()
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.text = """
+        html = """
         <html>
         <head><title>Test Visa Page</title></head>
         <body>
@@ -297,11 +455,12 @@ class TestCrawlerService:
         </body>
         </html>
         """
+        mock_response.encoding = 'utf-8'
+        mock_response.iter_content.return_value = [html.encode('utf-8')]
         mock_session.get.return_value = mock_response
-        mock_session_class.return_value = mock_session
 
         repo = CrawlerRepository(db_path=self.test_db)
-        engine = CrawlerEngine(self.test_config, repo)
+        engine = CrawlerEngine(self.test_config, repo, session=mock_session)
 
         # Crawl (will be mocked)
         result = engine.crawl_country(
@@ -311,9 +470,138 @@ class TestCrawlerService:
 
         assert result['country'] == 'TestCountry', "Country should match"
         assert result['pages_crawled'] > 0, "Should have crawled pages"
+        assert result['pages_saved'] == 1, "Should save the relevant page"
 
         print("✅ Engine crawl works (mocked)")
 
+    def test_engine_concurrent_crawl(self):
+        """Test pages are fetched in parallel batches"""
+        print("\n⚡ Testing Concurrent Crawl...")
+
+        pages = {
+            'http://example.com/visa': '<html><head><title>Visa</title></head><body>'
+                                       '<a href="/permit">p</a><a href="/work-visa">w</a></body></html>',
+            'http://example.com/permit': '<html><head><title>Permit</title></head><body>permit</body></html>',
+            'http://example.com/work-visa': '<html><head><title>Work</title></head><body>visa</body></html>',
+        }
+
+        def get(url, **kwargs):
+            response = Mock()
+            response.encoding = 'utf-8'
+            response.iter_content.return_value = [pages[url].encode('utf-8')]
+            return response
+
+        mock_session = Mock()
+        mock_session.get.side_effect = get
+
+        config = dict(self.test_config)
+        config['crawling'] = dict(self.test_config['crawling'], concurrent_requests=4, delay_between_requests=0)
+
+        repo = CrawlerRepository(db_path=self.test_db)
+        engine = CrawlerEngine(config, repo, session=mock_session)
+        result = engine.crawl_country('ConcurrentCountry', ['http://example.com/visa'])
+
+        assert result['pages_crawled'] == 3, "Should crawl seed and both linked pages"
+        assert result['pages_saved'] == 3, "Should save all relevant pages"
+        assert mock_session.get.call_count == 3, "Each URL should be fetched once"
+
+        print("✅ Concurrent crawl works")
+
+    def test_engine_per_host_rate_limit(self):
+        """Test request delay is applied per host"""
+        print("\n⏱️ Testing Per-Host Rate Limit...")
+
+        config = dict(self.test_config)
+        config['crawling'] = dict(self.test_config['crawling'], delay_between_requests=10)
+        engine = CrawlerEngine(config, CrawlerRepository(db_path=self.test_db), session=Mock())
+
+        with patch('services.crawler.engine.time.sleep') as sleep:
+            engine._wait_for_host('http://a.example.com/1')
+            engine._wait_for_host('http://b.example.com/1')
+            assert sleep.call_count == 0, "First request to each host should not wait"
+
+            engine._wait_for_host('http://a.example.com/2')
+            assert sleep.call_count == 1, "Second request to a host should wait"
+            assert 9 < sleep.call_args[0][0] <= 10, "Should wait about one delay"
+
+        print("✅ Per-host rate limit works")
+
+    def test_engine_fetch_stops_at_cap(self):
+        """Test irrelevant pages stop downloading at the byte cap"""
+        print("\n✂️ Testing Streamed Fetch Cap...")
+
+        repo = CrawlerRepository(db_path=self.test_db)
+        config = dict(self.test_config)
+        config['crawling'] = dict(self.test_config['crawling'], max_page_bytes=1000)
+        engine = CrawlerEngine(config, repo, session=Mock())
+
+        chunks_read = []
+
+        def iter_content(chunk_size):
+            for i in range(100):
+                chunks_read.append(i)
+                yield b'<p>sports and weather</p>' * 20
+
+        mock_response = Mock()
+        mock_response.encoding = 'utf-8'
+        mock_response.iter_content.side_effect = iter_content
+        engine.session.get.return_value = mock_response
+
+        assert engine._fetch('http://example.com/big') is None, "Should skip irrelevant page"
+        assert len(chunks_read) == 2, "Should stop reading at the byte cap"
+        mock_response.close.assert_called_once()
+
+        # Keyword split across a chunk boundary is still found
+        mock_response.iter_content.side_effect = lambda chunk_size: iter([b'<p>vi', b'sa</p>'])
+        assert engine._fetch('http://example.com/split') == '<p>visa</p>', "Should match across chunks"
+
+        # Irrelevant pages are abandoned after the scan window; relevant
+        # pages keep downloading up to the byte cap
+        config['crawling'] = dict(config['crawling'], max_page_bytes=100000, relevance_scan_bytes=600)
+        engine = CrawlerEngine(config, repo, session=Mock())
+        engine.session.get.return_value = mock_response
+        chunks_read.clear()
+        mock_response.iter_content.side_effect = iter_content
+        assert engine._fetch('http://example.com/big') is None, "Should skip irrelevant page"
+        assert len(chunks_read) == 2, "Should stop at the relevance scan window"
+
+        mock_response.iter_content.side_effect = lambda chunk_size: iter(
+            [b'<p>visa</p>'] + [b'<p>details</p>' * 40] * 5
+        )
+        html = engine._fetch('http://example.com/long')
+        assert html is not None and len(html) > 600, "Should read relevant pages past the scan window"
+
+        print("✅ Streamed fetch cap works")
+
+    def test_browser_engine_parse(self):
+        """Test browser engine builds pages from rendered HTML"""
+        print("\n🌐 Testing Browser Engine Parsing...")
+
+        html = """
+        <html><head><title> Visa Page </title><script>var x;</script></head>
+        <body>
+            <nav>Menu</nav>
+            <p>Visa information</p>
+            <a href="/apply">Apply</a>
+            <a href="/apply">Apply again</a>
+            <a href="/news/today">News</a>
+            <a href="http://other.com/">Elsewhere</a>
+        </body></html>
+        """
+        context = Mock()
+        context.new_page.return_value.content.return_value = html
+
+        engine = BrowserCrawlerEngine(self.test_config, CrawlerRepository(db_path=self.test_db))
+        page = engine._crawl_page(context, 'http://example.com/visa', 'TestCountry', 1)
+
+        assert page is not None, "Should build a CrawledPage"
+        assert page.title == 'Visa Page', "Should strip title"
+        assert 'Menu' not in page.content and 'var x' not in page.content, "Should drop noise"
+        assert page.links == ['http://example.com/apply'], "Should keep unique, same-domain, non-excluded links"
+        assert page.metadata['depth'] == 1, "Should record depth"
+
+        print("✅ Browser engine parsing works")
+
     def test_service_integration(self):
         """Test CrawlerService integration"""
         print("\n🔧 Testing Service Integration...")
@@ -327,6 +615,41 @@ class TestCrawlerService:
             assert service.config is not None, "Should have config"
             assert service.repo is not None, "Should have repository"
             assert service.engine is not None, "Should have engine"
+
+            # Config is loaded once, but each service gets its own copy
+            other = CrawlerService(mode='browser')
+            assert other.config['mode'] == 'browser', "Should apply mode override"
+            assert service.config.get('mode') != 'browser', "Overrides should not leak between services"
+
+            # Saving settings drops the memoized crawler config
+            from services.crawler.interface import _load_crawler_config
+            from shared.service_config import clear_config_caches
+            assert _load_crawler_config.cache_info().currsize == 1, "Config should be memoized"
+            clear_config_caches()
+            assert _load_crawler_config.cache_info().currsize == 0, "Settings change should clear crawler config"
+
+            # Countries are crawled in parallel with separate engines
+            crawled = []
+            def fake_crawl(engine, name, seed_urls):
+                crawled.append(engine)
+                return {'country': name, 'pages_crawled': 0, 'pages_saved': 0, 'urls_queued': 0}
+            service.config['countries'] = [
+                {'name': 'A', 'seed_urls': ['http://a.example/']},
+                {'name': 'B', 'seed_urls': ['http://b.example/']}
+            ]
+            with patch.object(CrawlerEngine, 'crawl_country', fake_crawl):
+                results = service.crawl_all_countries()
+            assert [r['country'] for r in results] == ['A', 'B'], "Should keep country order"
+            assert crawled[0] is not crawled[1], "Each country should get its own engine"
+
+            # URL validation runs in parallel over the shared session
+            controller = CrawlerController()
+            session = Mock()
+            session.head.side_effect = lambda url, timeout: Mock(status_code=404 if 'missing' in url else 200)
+            with patch('services.crawler.interface.get_shared_session', return_value=session):
+                valid = controller.validate_urls(['http://example.com/visa', 'http://example.com/missing'])
+            assert valid == {'http://example.com/visa': True, 'http://example.com/missing': False}, \
+                "Should report each URL's status"
             print("✅ Service integration works")
         except Exception as e:
             print(f"⚠️ Service integration test skipped (needs config files): {e}")
@@ -344,9 +667,17 @@ class TestCrawlerService:
             self.test_engine_parse_page()
             self.test_engine_breadcrumb_extraction()
             self.test_engine_link_extraction()
+            self.test_engine_link_canonicalization()
             self.test_engine_attachment_extraction()
+            self.test_visited_bloom_filter()
+            self.test_engine_frontier_priority()
+            self.test_engine_shared_session()
             self.test_engine_reset()
             self.test_engine_crawl_with_mock()
+            self.test_engine_concurrent_crawl()
+            self.test_engine_per_host_rate_limit()
+            self.test_engine_fetch_stops_at_cap()
+            self.test_browser_engine_parse()
             self.test_service_integration()
 
             print("\n" + "=" * 60)
@@ -0,0 +1,141 @@
+"""
+Test Database - Visa Storage and Statistics
+Tests visa counts, batch visa saves with version history, and stats counters
+"""
+
+import os
+import sys
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from shared.database import Database
+
+
+class TestDatabase:
+    """Test Database visa and stats functionality"""
+
+    def __init__(self):
+        # Create temporary directory for test database
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_db = os.path.join(self.temp_dir, 'test_immigration.db')
+
+        # Database handles schema initialization
+        self.db = Database(db_path=self.test_db)
+
+    def cleanup(self):
+        """Clean up test files"""
+        self.db.close()
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_count_visas(self):
+        """Test counting latest visas"""
+        print("\n🔢 Testing visa counts...")
+
+        self.db.save_visa('Test Visa', 'TestCountry', 'work', {}, {}, '')
+        self.db.save_visa('Test Visa', 'TestCountry', 'work', {}, {}, '2 weeks')
+
+        assert self.db.count_visas() == 1, "Should count latest visas"
+        assert self.db.count_visas(country='TestCountry') == 1, "Should count visas for a country"
+        assert self.db.count_visas(country='Elsewhere') == 0, "Should filter count by country"
+
+        print("✅ Visa counts work")
+
+    def test_save_visas_batch(self):
+        """Test batch visa saves continue version numbering"""
+        print("\n📦 Testing batch visa save...")
+
+        # A new version of an existing visa plus a new one
+        saved = self.db.save_visas_batch([
+            {'visa_type': 'Test Visa', 'country': 'TestCountry', 'category': 'work',
+             'requirements': {'min_age': 18}, 'fees': {}, 'processing_time': '4 weeks'},
+            {'visa_type': 'Study Visa', 'country': 'TestCountry', 'category': 'study',
+             'requirements': {}, 'fees': {}, 'processing_time': ''}
+        ])
+        assert saved == 2, "Should save both visas in one batch"
+
+        visas = {v.visa_type: v for v in self.db.get_visas(country='TestCountry')}
+        assert len(visas) == 2, "Should have one latest row per visa"
+        assert visas['Test Visa'].version == 3, "Batch should continue version numbering"
+        assert visas['Test Visa'].requirements == {'min_age': 18}, "Batch should store the new version"
+        assert not hasattr(visas['Test Visa'], '__dict__'), "Visas should use slots"
+
+        streamed = next(v for v in self.db.iter_latest_visas(country='TestCountry') if v['visa_type'] == 'Test Visa')
+        assert streamed['requirements'] == {'min_age': 18}, "Streamed visas should have JSON fields parsed"
+
+        print("✅ Batch visa save works")
+
+    def test_batch_history(self):
+        """Test batch saves only close the latest version, like save_visa"""
+        print("\n📜 Testing batch visa history...")
+
+        for _ in range(2):
+            self.db.save_visa('History Visa', 'HistoryCountry', 'work', {}, {}, '')
+        with self.db.get_connection('rw') as conn:
+            conn.execute("""
+                UPDATE visas SET valid_to = '2000-01-01 00:00:00'
+                WHERE visa_type = 'History Visa' AND version = 1
+            """)
+        self.db.save_visas_batch([
+            {'visa_type': 'History Visa', 'country': 'HistoryCountry', 'category': 'work',
+             'requirements': {}, 'fees': {}, 'processing_time': ''}
+        ])
+
+        history = {v['version']: v for v in self.db.get_visa_history('History Visa', 'HistoryCountry')}
+        assert history[1]['valid_to'] == '2000-01-01 00:00:00', "Batch should not rewrite older versions"
+        assert history[2]['valid_to'] is not None and not history[2]['is_latest'], "Batch should close the latest version"
+        assert history[3]['is_latest'] and history[3]['valid_to'] is None, "Batch version should be latest"
+
+        print("✅ Batch visa history works")
+
+    def test_stats(self):
+        """Test trigger-maintained counters track latest rows only"""
+        print("\n📈 Testing stats counters...")
+
+        self.db.save_crawled_page('http://example.com/visa', 'TestCountry', 'Visa', 'Visa info', {})
+        self.db.save_crawled_page('http://example.com/visa', 'TestCountry', 'Visa', 'Updated info', {})
+        self.db.save_crawled_page('http://example.com/permit', 'TestCountry', 'Permit', 'Permit info', {})
+
+        stats = self.db.get_stats()
+        assert stats['pages_crawled'] == 2, "Stats should count latest pages"
+        assert stats['visas_total'] == 3, "Stats should count latest visas"
+        assert stats['countries'] == 2, "Stats should count distinct countries"
+
+        print("✅ Stats counters work")
+
+    def run_all_tests(self):
+        """Run all tests"""
+        print("\n" + "=" * 60)
+        print("🧪 TESTING DATABASE")
+        print("=" * 60)
+
+        try:
+            self.test_count_visas()
+            self.test_save_visas_batch()
+            self.test_batch_history()
+            self.test_stats()
+
+            print("\n" + "=" * 60)
+            print("🎉 ALL DATABASE TESTS PASSED!")
+            print("=" * 60)
+            return True
+
+        except AssertionError as e:
+            print(f"\n❌ TEST FAILED: {e}")
+            return False
+
+        finally:
+            self.cleanup()
+
+
+def main():
+    """Run all Database tests"""
+    tester = TestDatabase()
+    success = tester.run_all_tests()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
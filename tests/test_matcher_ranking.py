@@ -0,0 +1,186 @@
+"""
+Test Matcher Ranking - Vectorized Scoring and Ranking
+Tests vectorized scores, rank order and limits, eligible-only ranking and country filtering
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from services.matcher.ranker import VisaRanker, _rank_order
+from services.matcher.scorer import build_requirement_matrix
+from shared.config_manager import load_yaml_file
+
+
+def _visa(country, visa_type, **requirements):
+    """Build a minimal visa record"""
+    return {
+        'country': country,
+        'visa_type': visa_type,
+        'category': 'work',
+        'requirements': requirements,
+    }
+
+
+class TestMatcherRanking:
+    """Test matcher scoring and ranking paths"""
+
+    def __init__(self):
+        self.config = load_yaml_file('services/matcher/config.yaml')
+        self.ranker = VisaRanker(self.config)
+        self.scorer = self.ranker.scorer
+
+        self.user = {
+            'age': 30,
+            'education': 'bachelors',
+            'experience_years': 3,
+            'target_countries': [],
+        }
+        self.visas = [
+            _visa('Canada', 'Express Entry', age={'min': 18, 'max': 45}, education='bachelors'),
+            _visa('Canada', 'Research Permit', education='phd', experience_years=5),
+            _visa('Australia', 'Skilled Independent', age={'min': 18, 'max': 25}),
+            _visa('Australia', 'Employer Sponsored', experience_years=2),
+            _visa('Germany', 'Blue Card', education='masters', experience_years=3),
+            _visa('Germany', 'Job Seeker', age={'max': 45}, education='Bachelors', experience_years=6),
+            _visa('Portugal', 'D7'),
+        ]
+
+    def test_vectorized_scores(self):
+        """Test vectorized scores match the per-visa scorer"""
+        print("\n📊 Testing vectorized scores...")
+
+        requirements = [visa['requirements'] for visa in self.visas]
+        matrix = build_requirement_matrix(requirements)
+        assert matrix is not None, "Numeric requirements should build a matrix"
+
+        vectorized = self.scorer.calculate_scores_vectorized(self.user, matrix)
+        expected = [self.scorer.score_and_gaps(self.user, req)[0] for req in requirements]
+        assert np.allclose(vectorized, expected), f"Vectorized {vectorized} != per-visa {expected}"
+
+        combined = self.scorer.calculate_total_scores(self.user, requirements)
+        assert np.allclose(combined, expected), "calculate_total_scores should match per-visa scores"
+
+        # Non-numeric requirements fall back to the per-visa path
+        assert build_requirement_matrix([{'age': '18-45 years'}]) is None, \
+            "Non-numeric age should not build a matrix"
+
+        print("✅ Vectorized scores match score_and_gaps")
+
+    def test_rank_order(self):
+        """Test rank order ties and limit handling"""
+        print("\n🏆 Testing rank order...")
+
+        # 79.96 and 80.04 both round to 80.0 and tie with the exact 80.0
+        scores = np.array([50.0, 80.0, 100.0, 79.96, 80.04, 100.0, 10.0])
+
+        order = list(_rank_order(scores))
+        assert order == [2, 5, 1, 3, 4, 0, 6], f"Ties should keep input order, got {order}"
+
+        assert list(_rank_order(scores, 0)) == [], "limit=0 should select nothing"
+        assert list(_rank_order(scores, -1)) == [], "Negative limit should select nothing"
+        assert list(_rank_order(scores, len(scores) + 5)) == order, "limit > N should rank everything"
+        assert list(_rank_order(scores, len(scores))) == order, "limit == N should rank everything"
+
+        for limit in range(1, len(scores)):
+            top = list(_rank_order(scores, limit))
+            assert top == order[:limit], f"limit={limit} should be the top prefix, got {top}"
+
+        assert list(_rank_order(np.array([]), 3)) == [], "Empty scores should rank nothing"
+
+        print("✅ Rank order is stable and respects limits")
+
+    def test_rank_all_visas_limit(self):
+        """Test limited ranking returns the top of the full ranking"""
+        print("\n🔢 Testing rank_all_visas limit...")
+
+        full = self.ranker.rank_all_visas(self.user, self.visas)
+        assert len(full) == len(self.visas), "Unlimited ranking should include every visa"
+
+        scores = [m['eligibility_score'] for m in full]
+        assert scores == sorted(scores, reverse=True), "Matches should be sorted by score"
+
+        top = self.ranker.rank_all_visas(self.user, self.visas, limit=3)
+        assert top == full[:3], "limit=3 should return the first three matches"
+        assert self.ranker.rank_all_visas(self.user, self.visas, limit=0) == [], \
+            "limit=0 should return no matches"
+
+        print("✅ rank_all_visas limit works")
+
+    def test_eligible_only(self):
+        """Test the eligible-only fast path matches filtered full ranking"""
+        print("\n✅ Testing eligible-only ranking...")
+
+        users = [
+            self.user,
+            {'age': 50, 'education': 'phd', 'experience_years': 10},
+            {'age': 22, 'education': 'secondary', 'experience_years': 0},
+        ]
+        for user in users:
+            eligible = self.ranker.get_eligible_visas(user, self.visas)
+            expected = [m for m in self.ranker.rank_all_visas(user, self.visas) if m['eligible']]
+            assert eligible == expected, f"Eligible-only results differ for {user}"
+            assert all(not m['gaps'] for m in eligible), "Eligible matches should have no gaps"
+
+        eligible_types = [m['visa_type'] for m in self.ranker.get_eligible_visas(self.user, self.visas)]
+        assert eligible_types == ['Express Entry', 'Employer Sponsored', 'D7'], \
+            f"Tied eligible visas should keep input order, got {eligible_types}"
+
+        print("✅ Eligible-only path matches rank_all_visas")
+
+    def test_target_countries(self):
+        """Test filtering by target countries"""
+        print("\n🌍 Testing target country filter...")
+
+        user = dict(self.user, target_countries=['canada', 'GERMANY'])
+
+        ranked = self.ranker.rank_all_visas(user, self.visas)
+        assert {m['country'] for m in ranked} == {'Canada', 'Germany'}, \
+            "Only target countries should be ranked (case-insensitive)"
+        assert len(ranked) == 4, f"Expected 4 visas, got {len(ranked)}"
+
+        eligible = self.ranker.get_eligible_visas(user, self.visas)
+        assert all(m['country'] in ('Canada', 'Germany') for m in eligible), \
+            "Eligible-only path should apply the same filter"
+
+        user_none = dict(self.user, target_countries=None)
+        assert len(self.ranker.rank_all_visas(user_none, self.visas)) == len(self.visas), \
+            "No target countries should keep every visa"
+
+        print("✅ Target country filter works")
+
+    def run_all_tests(self):
+        """Run all tests"""
+        print("\n" + "=" * 60)
+        print("🧪 TESTING MATCHER RANKING")
+        print("=" * 60)
+
+        try:
+            self.test_vectorized_scores()
+            self.test_rank_order()
+            self.test_rank_all_visas_limit()
+            self.test_eligible_only()
+            self.test_target_countries()
+
+            print("\n" + "=" * 60)
+            print("🎉 ALL MATCHER RANKING TESTS PASSED!")
+            print("=" * 60)
+            return True
+
+        except AssertionError as e:
+            print(f"\n❌ TEST FAILED: {e}")
+            return False
+
+
+def main():
+    """Run all matcher ranking tests"""
+    tester = TestMatcherRanking()
+    success = tester.run_all_tests()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()